@@ -0,0 +1,37 @@
+import { NextResponse } from 'next/server';
+
+export async function GET(
+    request: Request,
+    { params }: { params: Promise<{ league: string; id2: string }> }
+) {
+    const { league, id2 } = await params;
+
+    try {
+        // Single match (league slug + id2) instead of the whole oriol slate
+        const response = await fetch(
+            `http://185.254.96.194:8001/api/oriol-odds/${encodeURIComponent(league)}/${encodeURIComponent(id2)}`,
+            {
+                headers: {
+                    'Cache-Control': 'no-store'
+                }
+            }
+        );
+
+        if (response.status === 404) {
+            return NextResponse.json({ error: "Match not found" }, { status: 404 });
+        }
+
+        if (!response.ok) {
+            throw new Error(`Upstream API failed with status: ${response.status}`);
+        }
+
+        const data = await response.json();
+        return NextResponse.json(data);
+    } catch (error: any) {
+        console.error("Proxy Error:", error);
+        return NextResponse.json(
+            { error: "Failed to fetch match data", details: error.message },
+            { status: 500 }
+        );
+    }
+}
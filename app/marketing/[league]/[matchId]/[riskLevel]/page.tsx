@@ -510,34 +510,15 @@ export default function MarketingPage() {
     useEffect(() => {
         const fetchMatch = async () => {
             try {
-                // Fetch all odds from the same source as the Telegram page
-                const res = await fetch('/api/oriol-odds');
-                const data = await res.json();
-
-                // [UPDATED] Find match by ID2 AND League Slug
-                const found = data.matches.find((m: Match) => {
-                    // Check ID Match (Sequential ID)
-                    // Ensure type safety (number vs string)
-                    if (m.id2 != Number(matchId)) return false;
-
-                    // Check League Match
-                    // Slugify the match's league name using same logic as link generator
-                    // Fallback to league if header missing
-                    const leagueName = m.league_header?.name || m.tournament?.name || "";
-                    const mSlug = leagueName.toLowerCase().replace(/[^a-z0-9]+/g, '-').replace(/(^-|-$)/g, '');
-
-                    // Compare with URL param 'league'
-                    // NOTE: Sometimes slug might be slightly different if params had extra encoding?
-                    // But usually exact match should work given we generated it.
-                    return mSlug === league;
-                });
-
-                if (found) {
-                    setMatch(found);
+                // Only this match: the API indexes oriol matches by league slug + id2
+                // (same slug the Telegram page builds the link with)
+                const res = await fetch(`/api/oriol-odds/${league}/${matchId}`);
+
+                if (res.ok) {
+                    const data = await res.json();
+                    setMatch(data.match);
                 } else {
-                    // Fallback: If not found, try finding just by ID if unique? Dangerous. 
-                    // Or log.
-                    console.log("Match not found by league slug, checking fallback...");
+                    console.log("Match not found by league slug + id2:", league, matchId);
                 }
             } catch (e) {
                 console.error("Error fetching match:", e);
@@ -0,0 +1,83 @@
+import statistics
+import sys
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from job_runner import IsolatedJob
+
+# Usage: python bench_api_latency.py [seconds]
+# p50/p99 of GET /api/fast-odds while a CPU-heavy "scrape" (bs4 over a synthetic
+# live page) runs: idle, in a thread inside the API process, in a worker process.
+# Then checks that a hung job is killed at its timeout.
+
+SCRAPE_SECONDS = 4
+
+
+def cpu_scrape():
+    """Stand-in for a scraper cycle: BeautifulSoup parsing until SCRAPE_SECONDS is up."""
+    from bench_fast_parse import synthetic_page, extract_rows_bs
+    html = synthetic_page(600)
+    rows = []
+    end = time.time() + SCRAPE_SECONDS
+    while time.time() < end:
+        rows = extract_rows_bs(html)
+    return rows
+
+
+def hang():
+    time.sleep(3600)
+
+
+def measure(client, seconds):
+    latencies = []
+    end = time.time() + seconds
+    while time.time() < end:
+        t0 = time.perf_counter()
+        client.get("/api/fast-odds")
+        latencies.append((time.perf_counter() - t0) * 1000)
+        time.sleep(0.005)
+    latencies.sort()
+    return statistics.median(latencies), latencies[int(len(latencies) * 0.99) - 1], len(latencies)
+
+
+def run(seconds=SCRAPE_SECONDS):
+    import main
+    main.fast_snapshots.publish({
+        "matches": [{"id": str(i), "home_team": f"Home {i}", "away_team": f"Away {i}", "over_2_5_odds": 1.9} for i in range(150)],
+        "count": 150, "status": "ready"
+    })
+    client = TestClient(main.app)
+
+    def report(label, result):
+        p50, p99, n = result
+        print(f"{label:<22} p50 {p50:6.2f} ms   p99 {p99:7.2f} ms   ({n} requests)")
+
+    report("idle", measure(client, seconds))
+
+    worker = threading.Thread(target=cpu_scrape)
+    worker.start()
+    report("scrape in thread", measure(client, seconds))
+    worker.join()
+
+    job = IsolatedJob("bench", "bench_api_latency:cpu_scrape", timeout=120)
+    job.run()  # Warm-up: worker start + imports are not part of a cycle
+    worker = threading.Thread(target=job.run)
+    worker.start()
+    report("scrape in process", measure(client, seconds))
+    worker.join()
+    print(f"Result payload: {job.last_payload_bytes / 1024:.0f} KB compressed")
+    job.stop()
+
+    hung = IsolatedJob("hang", "bench_api_latency:hang", timeout=2)
+    t0 = time.time()
+    try:
+        hung.run()
+    except TimeoutError as e:
+        print(f"Hung job: {e} after {time.time() - t0:.1f}s, restarts={hung.restarts}")
+    hung.stop()
+
+
+if __name__ == "__main__":
+    run(float(sys.argv[1]) if len(sys.argv) > 1 else SCRAPE_SECONDS)
@@ -0,0 +1,105 @@
+import sys
+import time
+import tracemalloc
+
+from scraper_fast import extract_rows_bs, EXTRACT_ROWS_JS
+
+# Usage:
+#   python bench_fast_parse.py page1.html page2.html   (saved with FAST_SNAPSHOT_DIR=...)
+#   python bench_fast_parse.py                         (synthetic live page, 300 rows)
+
+
+def synthetic_page(n_rows=300, rows_per_league=10):
+    """Roughly the structure of tonybet.com/cl/live/football, markets included."""
+    parts = ["<html><body><div data-test='eventsTable'>"]
+    for i in range(n_rows):
+        if i % rows_per_league == 0:
+            parts.append(
+                f"<div data-test='eventTableHeader'><img src='/icons/football.svg'>"
+                f"<img src='/flags/{i}.svg'><a data-test='leagueLink'>League {i // rows_per_league}</a>"
+                f"<span>1X2</span><span>Total</span></div>"
+            )
+        timer = f"<div data-test='liveTimer'><span>{i % 90}'</span> <span>2T</span></div>" if i % 7 else "<span>Descanso</span>"
+        markets = "".join(
+            f"<div data-test='marketItem'><span data-test='outcome'>{1 + k / 10:.2f}</span></div>" for k in range(12)
+        )
+        parts.append(
+            f"<div data-test='eventTableRow'><a data-test='eventLink' href='/live/football/100-league/{7800000 + i}-home-away'>"
+            f"<div data-test='teamSeoTitles'>"
+            f"<div data-test='teamName'>Home Team {i}</div><div data-test='teamScore'>{i % 3}</div>"
+            f"<div data-test='teamName'>Away Team {i}</div><div data-test='teamScore'>{i % 2}</div>"
+            f"</div></a>{timer}{markets}</div>"
+        )
+    parts.append("</div></body></html>")
+    return "".join(parts)
+
+
+def bench_bs(html, repeat=3):
+    best = None
+    for _ in range(repeat):
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        rows = extract_rows_bs(html)
+        elapsed = time.perf_counter() - t0
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        if best is None or elapsed < best[0]:
+            best = (elapsed, peak, rows)
+    return best
+
+
+def bench_js(html, repeat=3):
+    """Needs Playwright + Chromium. Times page.content() vs page.evaluate(EXTRACT_ROWS_JS) on the same DOM."""
+    from playwright.sync_api import sync_playwright
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        page = browser.new_page()
+        page.set_content(html)
+
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            page.content()
+        content_time = (time.perf_counter() - t0) / repeat
+
+        best = None
+        for _ in range(repeat):
+            tracemalloc.start()
+            t0 = time.perf_counter()
+            rows = page.evaluate(EXTRACT_ROWS_JS)
+            elapsed = time.perf_counter() - t0
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            if best is None or elapsed < best[0]:
+                best = (elapsed, peak, rows)
+        browser.close()
+    return content_time, best
+
+
+def run(paths):
+    pages = []
+    if paths:
+        for path in paths:
+            with open(path, 'r', encoding='utf-8') as f:
+                pages.append((path, f.read()))
+    else:
+        pages.append(("synthetic", synthetic_page()))
+
+    for name, html in pages:
+        print(f"\n=== {name} ({len(html) / 1024:.0f} KB) ===")
+        bs_time, bs_peak, bs_rows = bench_bs(html)
+        print(f"bs4 html.parser : {bs_time * 1000:8.1f} ms  peak {bs_peak / 1024 / 1024:6.1f} MB  rows {len(bs_rows)}")
+
+        try:
+            content_time, (js_time, js_peak, js_rows) = bench_js(html)
+        except Exception as e:
+            print(f"in-page JS      : skipped ({e.__class__.__name__}: {str(e).splitlines()[0]})")
+            continue
+
+        print(f"page.content()  : {content_time * 1000:8.1f} ms  (transfer the bs4 path also pays)")
+        print(f"in-page JS      : {js_time * 1000:8.1f} ms  peak {js_peak / 1024 / 1024:6.1f} MB  rows {len(js_rows)}")
+        print(f"Rows identical  : {js_rows == bs_rows}")
+
+
+if __name__ == "__main__":
+    run(sys.argv[1:])
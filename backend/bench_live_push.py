@@ -0,0 +1,106 @@
+import asyncio
+import resource
+import sys
+import threading
+import time
+
+import uvicorn
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+
+from live_push import Broadcaster
+from snapshots import SnapshotStore
+
+HOST = "127.0.0.1"
+PORT = 8765
+
+
+def build_app(store, push):
+    # Same wiring as main.py, without the scrapers
+    app = FastAPI()
+    store.on_publish(lambda prev, snap: push.publish_changes("fast", store, prev, snap))
+
+    @app.get("/api/stream")
+    async def stream_updates():
+        return StreamingResponse(push.stream(lambda: {"fast": store.version}), media_type="text/event-stream")
+
+    return app
+
+
+async def open_subscriber(ready, received):
+    reader, writer = await asyncio.open_connection(HOST, PORT)
+    writer.write(f"GET /api/stream HTTP/1.1\r\nHost: {HOST}\r\n\r\n".encode())
+    await writer.drain()
+    hello_seen = False
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            if line.startswith(b"event: hello") and not hello_seen:
+                hello_seen = True
+                ready.append(1)
+            elif line.startswith(b"event: fast"):
+                received.append(time.perf_counter())
+    except (ConnectionError, asyncio.CancelledError):
+        pass
+    finally:
+        writer.close()
+
+
+async def run_clients(n_clients, store):
+    ready = []
+    received = []
+    tasks = []
+    t0 = time.perf_counter()
+    for i in range(n_clients):
+        tasks.append(asyncio.create_task(open_subscriber(ready, received)))
+        if i % 200 == 0:
+            await asyncio.sleep(0)  # Don't flood the accept backlog
+    while len(ready) < n_clients and time.perf_counter() - t0 < 60:
+        await asyncio.sleep(0.1)
+    print(f"Connected {len(ready)}/{n_clients} idle subscribers in {time.perf_counter() - t0:.2f}s")
+
+    # Two publishes from a "scraper" thread, like background_scraper_fast does
+    matches = [{"id": str(i), "home_team": f"Home {i}", "away_team": f"Away {i}", "over_2_5_odds": 1.8} for i in range(200)]
+    moved = [dict(m, over_2_5_odds=1.9) if i < 5 else m for i, m in enumerate(matches)]
+
+    def scraper_thread():
+        store.publish({"matches": matches, "count": len(matches), "status": "ready"})
+        store.publish({"matches": moved, "count": len(moved), "status": "ready"})
+
+    t_publish = time.perf_counter()
+    threading.Thread(target=scraper_thread).start()
+
+    while len(received) < 2 * len(ready) and time.perf_counter() - t_publish < 30:
+        await asyncio.sleep(0.05)
+    if received:
+        print(f"Delivered {len(received)} delta frames (2 versions x {len(ready)} subscribers), "
+              f"last one {(max(received) - t_publish) * 1000:.0f} ms after publish")
+    else:
+        print("No delta delivered")
+
+    for t in tasks:
+        t.cancel()
+
+
+def main(n_clients=3000):
+    # Thousands of sockets (both ends live in this process)
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (min(hard, max(soft, n_clients * 2 + 256)), hard))
+
+    store = SnapshotStore("fast", {"matches": [], "count": 0, "status": "ready"}, key="id")
+    push = Broadcaster()
+    config = uvicorn.Config(build_app(store, push), host=HOST, port=PORT, log_level="warning", backlog=4096)
+    server = uvicorn.Server(config)
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+
+    asyncio.run(run_clients(n_clients, store))
+    print(f"Broadcaster: {push.stats()}")
+    server.should_exit = True
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 3000)
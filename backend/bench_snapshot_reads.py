@@ -0,0 +1,113 @@
+import json
+import threading
+import time
+
+from starlette.requests import Request
+
+import main
+from snapshots import snapshot_response
+
+# Usage: python bench_snapshot_reads.py
+# Parallel endpoint readers against a single publisher (one job per source), like production:
+#   locked   = old endpoint: take the cache lock, copy the list, serialize per request
+#              (the job holds the same lock while it rebuilds the cache)
+#   snapshot = current endpoint: snapshot_response(fast_snapshots.current(), request),
+#              while the fast job swaps main.fast_state and runs main.publish_fast_snapshot()
+
+DURATION = 2.0
+WRITER_EVERY = 0.2
+WRITER_HOLD = 0.05  # Old job: time spent merging under the lock
+
+REQUEST = Request({"type": "http", "method": "GET", "path": "/api/fast-odds",
+                   "headers": [(b"accept-encoding", b"gzip, br")]})
+
+
+def synthetic_matches(n=300, version=0):
+    return [
+        {"id": str(i), "home_team": f"Home {i}", "away_team": f"Away {i}", "league": f"League {i % 20}",
+         "over_2_5_odds": 1.9 + version / 1000, "goal_lines": [[0.5 + k, 1.1 + k / 10, 3.0 - k / 10] for k in range(8)]}
+        for i in range(n)
+    ]
+
+
+def run_locked(readers):
+    lock = threading.Lock()
+    cache = synthetic_matches()
+    stop = threading.Event()
+
+    def writer():
+        nonlocal cache
+        version = 0
+        while not stop.is_set():
+            version += 1
+            with lock:
+                time.sleep(WRITER_HOLD)
+                cache = synthetic_matches(version=version)
+            time.sleep(WRITER_EVERY)
+
+    def read():
+        with lock:
+            matches = [dict(m) for m in cache]
+        return json.dumps({"matches": matches, "count": len(matches), "status": "ready"})
+
+    return drive(readers, read, writer, stop)
+
+
+def run_snapshot(readers):
+    main.fast_state = main.fast_state.replace(matches=synthetic_matches())
+    main.publish_fast_snapshot()
+    stop = threading.Event()
+
+    def writer():
+        # The fast job: swap in the new raw state, then publish (the only writer)
+        version = 0
+        while not stop.is_set():
+            version += 1
+            main.fast_state = main.fast_state.replace(matches=synthetic_matches(version=version))
+            main.publish_fast_snapshot()
+            time.sleep(WRITER_EVERY)
+
+    def read():
+        return snapshot_response(main.fast_snapshots.current(), REQUEST)
+
+    return drive(readers, read, writer, stop)
+
+
+def drive(readers, read, writer, stop):
+    counts = [0] * readers
+    latencies = [[] for _ in range(readers)]
+
+    def reader(i):
+        end = time.time() + DURATION
+        while time.time() < end:
+            t0 = time.perf_counter()
+            read()
+            latencies[i].append(time.perf_counter() - t0)
+            counts[i] += 1
+
+    w = threading.Thread(target=writer, daemon=True)
+    w.start()
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    stop.set()
+    w.join()
+
+    all_latencies = sorted(l for per in latencies for l in per)
+    p99 = all_latencies[int(len(all_latencies) * 0.99) - 1] if all_latencies else 0
+    return sum(counts) / DURATION, p99 * 1000
+
+
+def run():
+    print(f"{'readers':>7} | {'locked req/s':>12} {'p99 ms':>8} | {'snapshot req/s':>14} {'p99 ms':>8}")
+    for readers in (1, 2, 4, 8, 16):
+        locked_rps, locked_p99 = run_locked(readers)
+        snap_rps, snap_p99 = run_snapshot(readers)
+        print(f"{readers:>7} | {locked_rps:>12.0f} {locked_p99:>8.2f} | {snap_rps:>14.0f} {snap_p99:>8.3f}")
+    print(f"fast snapshot versions published: {main.fast_snapshots.version}")
+
+
+if __name__ == "__main__":
+    run()
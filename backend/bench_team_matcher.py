@@ -0,0 +1,85 @@
+import json
+import os
+import random
+import time
+import difflib
+
+from team_matcher import TeamMatcher, normalize_name, MATCH_THRESHOLD
+
+STATS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '365scores_live.json')
+
+
+def brute_force_match(stats_data, home_team, away_team):
+    """The old merge_stats_with_fast loop, kept here as the reference."""
+    home_fast = normalize_name(home_team)
+    away_fast = normalize_name(away_team)
+    best_score = 0
+    best_match = None
+    for s in stats_data:
+        ratio_home = difflib.SequenceMatcher(None, home_fast, normalize_name(s.get('homeTeam', ''))).ratio()
+        ratio_away = difflib.SequenceMatcher(None, away_fast, normalize_name(s.get('awayTeam', ''))).ratio()
+        avg_ratio = (ratio_home + ratio_away) / 2
+        if avg_ratio > best_score:
+            best_score = avg_ratio
+            best_match = s
+    return best_match if best_score > MATCH_THRESHOLD else None
+
+
+def distort(name, rng):
+    # Simulate Tonybet spelling: suffixes, dropped letters, case changes
+    choice = rng.randint(0, 3)
+    if choice == 0: return name + " FC"
+    if choice == 1 and len(name) > 6:
+        i = rng.randint(1, len(name) - 2)
+        return name[:i] + name[i + 1:]
+    if choice == 2: return name.upper()
+    return name
+
+
+def build_fast_mock(stats_data, rng, n_unknown=50):
+    fast = []
+    for s in stats_data:
+        fast.append({"home_team": distort(s.get('homeTeam', ''), rng), "away_team": distort(s.get('awayTeam', ''), rng)})
+    for i in range(n_unknown):
+        fast.append({"home_team": f"Random Team {i}", "away_team": f"Other Side {i}"})
+    rng.shuffle(fast)
+    return fast
+
+
+def run_bench(multiplier=4):
+    with open(STATS_FILE, 'r', encoding='utf-8') as f:
+        stats_data = json.load(f)
+
+    # Inflate the slate to look like a busy Saturday
+    big_stats = []
+    for k in range(multiplier):
+        for s in stats_data:
+            big_stats.append({**s, "id": f"{s.get('id')}-{k}", "homeTeam": s.get('homeTeam', '') + ("" if k == 0 else f" {k}")})
+
+    rng = random.Random(42)
+    fast = build_fast_mock(big_stats, rng)
+
+    t0 = time.perf_counter()
+    reference = [brute_force_match(big_stats, m['home_team'], m['away_team']) for m in fast]
+    t_brute = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    index = TeamMatcher(big_stats)
+    t_build = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    indexed = [index.best_match(m['home_team'], m['away_team'])[0] for m in fast]
+    t_index = time.perf_counter() - t0
+
+    mismatches = sum(1 for a, b in zip(reference, indexed) if a is not b)
+    matched = sum(1 for a in reference if a is not None)
+
+    print(f"Stats records: {len(big_stats)} | Fast matches: {len(fast)} | Matched: {matched}")
+    print(f"Brute force : {t_brute * 1000:.1f} ms")
+    print(f"Index build : {t_build * 1000:.1f} ms (once per stats change)")
+    print(f"Index lookup: {t_index * 1000:.1f} ms ({t_brute / max(t_index, 1e-9):.1f}x faster)")
+    print(f"Mismatches vs brute force: {mismatches}")
+
+
+if __name__ == "__main__":
+    run_bench()
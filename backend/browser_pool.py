@@ -0,0 +1,183 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from playwright.sync_api import sync_playwright
+
+from request_filter import RequestFilter, totals as filter_totals, totals_lock as filter_totals_lock
+
+try:
+    import psutil
+except ImportError:  # Optional: without it memory-based recycling is skipped
+    psutil = None
+
+LAUNCH_ARGS = [
+    '--no-sandbox',
+    '--disable-setuid-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-blink-features=AutomationControlled'
+]
+
+DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+# Relaunch a browser after this many leases...
+MAX_USES = int(os.getenv("BROWSER_POOL_MAX_USES", "50"))
+# ...or when all Chromium processes together use more than this (needs psutil)
+MAX_RSS_MB = int(os.getenv("BROWSER_POOL_MAX_RSS_MB", "1500"))
+
+
+class _ThreadBrowser:
+    """Browser owned by one scraper thread (the sync Playwright API is thread-bound)."""
+
+    def __init__(self):
+        self.playwright = None
+        self.browser = None
+        self.uses = 0
+        self.launched_at = 0
+
+
+class BrowserPool:
+    """
+    Long-lived Chromium instances shared across scraper cycles.
+
+    Each background thread keeps its own browser alive between cycles and
+    leases a fresh context per scrape. Cookies/localStorage are kept per
+    site key and restored into the next context, so sessions survive.
+    Browsers are relaunched when disconnected, after MAX_USES leases, or
+    when Chromium's total RSS goes over MAX_RSS_MB.
+    """
+
+    def __init__(self, max_uses=MAX_USES, max_rss_mb=MAX_RSS_MB):
+        self.max_uses = max_uses
+        self.max_rss_mb = max_rss_mb
+        self._local = threading.local()
+        self._states = {}  # site key -> storage_state dict
+        self._stats_lock = threading.Lock()
+        self.launches = 0
+        self.recycles = 0
+        self.leases = 0
+
+    def _slot(self):
+        slot = getattr(self._local, "slot", None)
+        if slot is None:
+            slot = _ThreadBrowser()
+            self._local.slot = slot
+        return slot
+
+    def chromium_rss_mb(self):
+        if psutil is None:
+            return None
+        total = 0
+        try:
+            for child in psutil.Process().children(recursive=True):
+                try:
+                    if "chrom" in child.name().lower() or "headless_shell" in child.name().lower():
+                        total += child.memory_info().rss
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    continue
+        except psutil.Error:
+            return None
+        return total / (1024 * 1024)
+
+    def _needs_recycle(self, slot):
+        if not slot.browser.is_connected():
+            return "disconnected"
+        if slot.uses >= self.max_uses:
+            return f"{slot.uses} uses"
+        rss = self.chromium_rss_mb()
+        if rss is not None and rss > self.max_rss_mb:
+            return f"chromium RSS {rss:.0f} MB"
+        return None
+
+    def _close(self, slot):
+        try:
+            slot.browser.close()
+        except Exception:
+            pass
+        slot.browser = None
+
+    def _ensure_browser(self, slot):
+        if slot.browser is not None:
+            reason = self._needs_recycle(slot)
+            if reason:
+                print(f"[BrowserPool] Recycling browser ({reason})")
+                self._close(slot)
+                with self._stats_lock:
+                    self.recycles += 1
+
+        if slot.browser is None:
+            if slot.playwright is None:
+                slot.playwright = sync_playwright().start()
+            slot.browser = slot.playwright.chromium.launch(headless=True, args=LAUNCH_ARGS)
+            slot.uses = 0
+            slot.launched_at = time.time()
+            with self._stats_lock:
+                self.launches += 1
+            print(f"[BrowserPool] Launched browser for thread {threading.current_thread().name}")
+
+        return slot.browser
+
+    @contextmanager
+    def lease(self, site, block=None, **context_options):
+        """
+        Yields a new BrowserContext on this thread's long-lived browser.
+        `site` groups cookie reuse (e.g. "tonybet", "365scores").
+        `block` names a request_filter policy ("fast", "live"...) to install.
+        Extra kwargs go to browser.new_context (user_agent, viewport, proxy...).
+        """
+        slot = self._slot()
+        browser = self._ensure_browser(slot)
+
+        context_options.setdefault("user_agent", DEFAULT_USER_AGENT)
+        state = self._states.get(site)
+        if state:
+            context_options["storage_state"] = state
+
+        context = browser.new_context(**context_options)
+        request_filter = RequestFilter(block).install(context) if block else None
+        slot.uses += 1
+        with self._stats_lock:
+            self.leases += 1
+
+        ok = False
+        try:
+            yield context
+            ok = True
+        finally:
+            if ok:
+                try:
+                    self._states[site] = context.storage_state()
+                except Exception:
+                    pass
+            try:
+                context.close()
+            except Exception:
+                pass
+            if request_filter:
+                print(request_filter.report())
+
+    def site_state(self, site):
+        """Saved cookies/localStorage of a site (None if none yet), for contexts made outside lease()."""
+        return self._states.get(site)
+
+    def save_site_state(self, site, state):
+        self._states[site] = state
+
+    def stats(self):
+        return {
+            "launches": self.launches,
+            "recycles": self.recycles,
+            "leases": self.leases,
+            "sites_with_cookies": sorted(self._states.keys()),
+            "chromium_rss_mb": self.chromium_rss_mb(),
+            "request_filter": self._filter_totals(),
+        }
+
+    def _filter_totals(self):
+        with filter_totals_lock:
+            return dict(filter_totals)
+
+
+# Shared by every scraper module
+browser_pool = BrowserPool()
@@ -0,0 +1,110 @@
+import os
+import threading
+import time
+
+# Fast/365 refresh bounds (seconds)
+BUSY_INTERVAL = int(os.getenv("CADENCE_MIN_INTERVAL", "30"))  # many matches in play / odds moving
+BASE_INTERVAL = int(os.getenv("CADENCE_BASE_INTERVAL", "120"))  # a few matches in play
+PAUSED_INTERVAL = int(os.getenv("CADENCE_PAUSED_INTERVAL", "240"))  # everything at half-time / finished
+IDLE_INTERVAL = int(os.getenv("CADENCE_IDLE_INTERVAL", "300"))  # no live events at all
+
+# In-play count at which we poll at BUSY_INTERVAL
+BUSY_MATCHES = 40
+# Mean relative move of the over odds (per line) that counts as "volatile"
+VOLATILE_MOVE = 0.03
+
+# current_minute values (or fragments of the live timer text) for a stopped match.
+# Compared without whitespace: scraper_fast strips every space out of the timer text
+PAUSED_EXACT = ("halftime", "end", "ht", "ft")
+PAUSED_FRAGMENTS = ("descanso", "mediotiempo", "finalizado", "halftime")
+
+
+def _squash(text):
+    return "".join((text or "").split()).lower()
+
+
+def match_phase(match):
+    """'in_play', 'paused' (half-time / finished) or 'not_started' from current_minute."""
+    minute = _squash(match.get("current_minute"))
+    if not minute or minute == "notstarted":
+        return "not_started"
+    if minute in PAUSED_EXACT or any(fragment in minute for fragment in PAUSED_FRAGMENTS):
+        return "paused"
+    return "in_play"
+
+
+def odds_volatility(previous, current):
+    """
+    Mean relative change of the over odds across every (match, line) present
+    in both cycles. 0.0 when nothing comparable.
+    """
+    before = {}
+    for m in previous or []:
+        for line, over, _ in m.get("goal_lines") or []:
+            if over:
+                before[(m.get("id"), line)] = over
+    moves = []
+    for m in current or []:
+        for line, over, _ in m.get("goal_lines") or []:
+            old = before.get((m.get("id"), line))
+            if old and over:
+                try:
+                    moves.append(abs(float(over) - float(old)) / float(old))
+                except (TypeError, ValueError, ZeroDivisionError):
+                    continue
+    return sum(moves) / len(moves) if moves else 0.0
+
+
+class LiveCadence:
+    """
+    Picks the fast/365 scheduler interval from the last fast cycle: how many
+    matches are in play and how much their odds moved. Polls every ~30s when
+    busy or volatile, backs off to minutes at half-time or with no live events.
+    """
+
+    def __init__(self, busy=BUSY_INTERVAL, base=BASE_INTERVAL, paused=PAUSED_INTERVAL, idle=IDLE_INTERVAL):
+        self.busy = busy
+        self.base = base
+        self.paused = paused
+        self.idle = idle
+        self._lock = threading.Lock()
+        self.phases = {"in_play": 0, "paused": 0, "not_started": 0}
+        self.volatility = 0.0
+        self.observed_at = None
+
+    def observe(self, previous, current):
+        """Call after each fast cycle with the previous and new match lists."""
+        phases = {"in_play": 0, "paused": 0, "not_started": 0}
+        for m in current or []:
+            phases[match_phase(m)] += 1
+        volatility = odds_volatility(previous, current)
+        with self._lock:
+            self.phases = phases
+            self.volatility = volatility
+            self.observed_at = time.time()
+
+    def interval(self, job=None):
+        """Scheduler interval_fn."""
+        with self._lock:
+            in_play = self.phases["in_play"]
+            paused = self.phases["paused"]
+            volatility = self.volatility
+
+        if in_play == 0:
+            return self.paused if paused else self.idle
+
+        # 0..1 each; whichever is higher pulls the interval from base towards busy
+        load = min(in_play / BUSY_MATCHES, 1.0)
+        movement = min(volatility / VOLATILE_MOVE, 1.0)
+        pressure = max(load, movement)
+        return self.base - (self.base - self.busy) * pressure
+
+    def info(self):
+        with self._lock:
+            info = {
+                "phases": dict(self.phases),
+                "odds_volatility": round(self.volatility, 4),
+                "observed_at": self.observed_at,
+            }
+        info["interval"] = round(self.interval(), 1)
+        return info
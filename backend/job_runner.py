@@ -0,0 +1,248 @@
+import importlib
+import json
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+import zlib
+
+# "process" = each scraper job runs in its own supervised worker process,
+# "thread" = old behaviour (scraper runs on the scheduler thread inside uvicorn)
+ISOLATION = os.getenv("SCRAPER_ISOLATION", "process").lower().strip()
+
+# spawn: the API process has live threads, so never fork it
+_mp = multiprocessing.get_context("spawn")
+
+
+def encode_result(obj):
+    """Compact wire format for scraper results: minified JSON + fast zlib."""
+    return zlib.compress(json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), 1)
+
+
+def decode_result(data):
+    return json.loads(zlib.decompress(data))
+
+
+def worker_stats():
+    """Browser pool + request filter counters of this worker (None if it never used the pool)."""
+    pool_module = sys.modules.get("browser_pool")
+    if pool_module is None:
+        return None
+    try:
+        stats = pool_module.browser_pool.stats()
+    except Exception:
+        return None
+    stats.pop("chromium_rss_mb", None)  # The API process measures all Chromium itself
+    return stats
+
+
+def add_counters(total, stats):
+    """Sums the numeric counters of stats into total (nested dicts too)."""
+    for key, value in (stats or {}).items():
+        if isinstance(value, dict):
+            add_counters(total.setdefault(key, {}), value)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            total[key] = total.get(key, 0) + value
+    return total
+
+
+def _worker_main(conn, target, env):
+    # Own process group, so a hung Chromium/driver tree can be killed as a whole
+    if hasattr(os, "setsid"):
+        os.setsid()
+    # Applied after spawn re-imported the parent's __main__ (and whatever it
+    # imports), so modules must read these at call time, not at import time
+    os.environ.update(env or {})
+
+    module_name, func_name = target.split(":")
+    func = getattr(importlib.import_module(module_name), func_name)
+
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            return
+        if message == "stop":
+            return
+        try:
+            result = func()
+            conn.send_bytes(b"K" + encode_result(result))
+        except Exception as e:
+            conn.send_bytes(b"E" + f"{e.__class__.__name__}: {e}".encode("utf-8", "replace"))
+        # Counters live in this process; the API process aggregates them (/api/browser-pool)
+        conn.send(worker_stats())
+
+
+class IsolatedJob:
+    """
+    One scraper function ("module:function") in a long-lived worker process.
+    The worker is reused between runs (its pooled browser stays warm) and is
+    killed with its whole process group and restarted on timeout or crash.
+    """
+
+    def __init__(self, name, target, timeout, env=None):
+        self.name = name
+        self.target = target
+        self.timeout = timeout
+        self.env = env or {}
+        self.process = None
+        self.conn = None
+        self._lock = threading.Lock()  # One run at a time (held while waiting for the result)
+        self.stopping = False
+        self.runs = 0
+        self.timeouts = 0
+        self.crashes = 0
+        self.restarts = 0
+        self.last_payload_bytes = None
+        self.pool_stats = None  # Last counters reported by the current worker
+        self.retired_stats = {}  # Counters of killed/restarted workers
+
+    def _ensure_worker(self):
+        if self.process is not None and self.process.is_alive():
+            return
+        if self.process is not None:
+            self._kill()
+            self.restarts += 1
+        parent_conn, child_conn = _mp.Pipe()
+        self.process = _mp.Process(
+            target=_worker_main, args=(child_conn, self.target, self.env),
+            name=f"scraper-{self.name}", daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+        print(f"[JobRunner] Started worker for {self.name} (pid {self.process.pid})")
+
+    def _kill(self):
+        process = self.process
+        self.process = None
+        if process is None:
+            return
+        # The worker's counters die with it; keep them in the running total
+        add_counters(self.retired_stats, self.pool_stats)
+        self.pool_stats = None
+        try:
+            if hasattr(os, "killpg") and process.pid:
+                os.killpg(process.pid, signal.SIGKILL)  # Worker + playwright driver + Chromium
+            else:
+                process.kill()
+        except (ProcessLookupError, PermissionError, OSError):
+            pass
+        process.join(5)
+        try:
+            self.conn.close()
+        except Exception:
+            pass
+
+    def run(self):
+        with self._lock:
+            if self.stopping:
+                raise RuntimeError(f"{self.name} is shutting down")
+            self._ensure_worker()
+            self.runs += 1
+            self.conn.send("run")
+
+            if not self.conn.poll(self.timeout):
+                self.timeouts += 1
+                self._kill()
+                self.restarts += 1
+                raise TimeoutError(f"{self.name} did not finish within {self.timeout}s, worker killed")
+
+            try:
+                data = self.conn.recv_bytes()
+            except (EOFError, OSError):
+                if self.stopping:
+                    raise RuntimeError(f"{self.name} worker stopped during shutdown")
+                self.crashes += 1
+                self._kill()
+                self.restarts += 1
+                raise RuntimeError(f"{self.name} worker died")
+
+            try:
+                if self.conn.poll(5):
+                    self.pool_stats = self.conn.recv()
+            except (EOFError, OSError):
+                pass  # Worker died after answering; the next run restarts it
+
+        kind, payload = data[:1], data[1:]
+        if kind == b"E":
+            raise RuntimeError(payload.decode("utf-8", "replace"))
+        self.last_payload_bytes = len(payload)
+        return decode_result(payload)
+
+    def stop(self):
+        """
+        Never waits for an in-flight run (that can take up to its timeout):
+        an idle worker gets a clean "stop", a busy one is killed with its
+        process group and the pending run() raises.
+        """
+        self.stopping = True
+        if not self._lock.acquire(blocking=False):
+            self._kill()
+            return
+        try:
+            if self.process is not None and self.process.is_alive():
+                try:
+                    self.conn.send("stop")
+                    self.process.join(5)
+                except Exception:
+                    pass
+            self._kill()
+        finally:
+            self._lock.release()
+
+    def info(self):
+        return {
+            "target": self.target,
+            "timeout": self.timeout,
+            "pid": self.process.pid if self.process is not None and self.process.is_alive() else None,
+            "runs": self.runs,
+            "timeouts": self.timeouts,
+            "crashes": self.crashes,
+            "restarts": self.restarts,
+            "last_payload_bytes": self.last_payload_bytes,
+        }
+
+    def browser_stats(self):
+        """Browser pool counters of this job over all its workers (None if it never used one)."""
+        if self.pool_stats is None and not self.retired_stats:
+            return None
+        return add_counters(add_counters({}, self.retired_stats), self.pool_stats)
+
+
+class JobRunner:
+    """Runs named scraper jobs isolated in worker processes (or inline when ISOLATION=thread)."""
+
+    def __init__(self, isolation=ISOLATION):
+        self.isolation = isolation
+        self.jobs = {}
+
+    @property
+    def isolated(self):
+        return self.isolation == "process"
+
+    def add(self, name, target, timeout, env=None):
+        self.jobs[name] = IsolatedJob(name, target, timeout, env=env)
+
+    def run(self, name):
+        job = self.jobs[name]
+        if not self.isolated:
+            module_name, func_name = job.target.split(":")
+            return getattr(importlib.import_module(module_name), func_name)()
+        return job.run()
+
+    def stop(self):
+        for job in self.jobs.values():
+            job.stop()
+
+    def browser_stats(self):
+        """Per-job browser pool / request filter counters from the workers, plus their sum."""
+        jobs = {name: job.browser_stats() for name, job in self.jobs.items()}
+        total = {}
+        for stats in jobs.values():
+            add_counters(total, stats)
+        return {"jobs": jobs, "total": total}
+
+    def info(self):
+        return {"isolation": self.isolation, "jobs": {name: job.info() for name, job in self.jobs.items()}}
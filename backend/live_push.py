@@ -0,0 +1,108 @@
+import asyncio
+import json
+
+KEEPALIVE_SECONDS = 15
+# Frames buffered per client before it is considered too slow and dropped
+MAX_PENDING = 64
+
+
+def format_event(event, data, event_id=None):
+    """Encodes one Server-Sent Events frame (compact JSON, single data line)."""
+    frame = f"event: {event}\n"
+    if event_id is not None:
+        frame += f"id: {event_id}\n"
+    frame += f"data: {json.dumps(data, ensure_ascii=False, separators=(',', ':'))}\n\n"
+    return frame.encode("utf-8")
+
+
+class Broadcaster:
+    """
+    Fan-out of SSE frames to every connected /api/stream client.
+
+    All subscribers live on the uvicorn event loop (one asyncio.Queue each,
+    no thread per client). Scraper threads call publish(), which serializes
+    the frame once and hands it to the loop with call_soon_threadsafe.
+    """
+
+    def __init__(self, max_pending=MAX_PENDING, keepalive=KEEPALIVE_SECONDS):
+        self.max_pending = max_pending
+        self.keepalive = keepalive
+        self.loop = None
+        self.subscribers = set()
+        self.frames_sent = 0
+        self.dropped = 0
+
+    def subscribe(self):
+        # Called from the event loop; remember it for thread-safe publishing
+        if self.loop is None:
+            self.loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=self.max_pending)
+        self.subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue):
+        self.subscribers.discard(queue)
+
+    def publish(self, event, data, event_id=None):
+        """Thread-safe. No-op until the first client connects."""
+        loop = self.loop
+        if loop is None or not self.subscribers:
+            return
+        frame = format_event(event, data, event_id)
+        try:
+            loop.call_soon_threadsafe(self._fan_out, frame)
+        except RuntimeError:
+            # Loop already closed (shutdown)
+            pass
+
+    def _fan_out(self, frame):
+        for queue in list(self.subscribers):
+            if queue.full():
+                # Slow consumer: drop it, the client reconnects and resyncs via hello
+                self.subscribers.discard(queue)
+                self.dropped += 1
+                continue
+            queue.put_nowait(frame)
+            self.frames_sent += 1
+
+    def publish_changes(self, event, store, previous, snapshot):
+        """Snapshot listener: pushes only the per-match delta between two versions."""
+        added, changed, removed = store.diff(previous, snapshot)
+        if not (added or changed or removed) and previous.payload.get("status") == snapshot.payload.get("status"):
+            return
+        self.publish(event, {
+            "since": previous.version,
+            "version": snapshot.version,
+            "added": added,
+            "changed": changed,
+            "removed": removed,
+            "count": snapshot.payload.get("count", 0),
+            "status": snapshot.payload.get("status"),
+        }, event_id=f"{event}-{snapshot.version}")  # fast and oriol share the stream: ids per source
+
+    async def stream(self, hello_fn):
+        """
+        Async generator for StreamingResponse. Subscribes, then sends a hello
+        frame with the current versions (hello_fn() is read after subscribing,
+        so no delta published in between is lost; at worst one arrives that the
+        hello already covers), then deltas as they are published, with
+        keepalive comments in between so proxies don't close idle connections.
+        """
+        queue = self.subscribe()
+        try:
+            yield format_event("hello", hello_fn())
+            while queue in self.subscribers:
+                try:
+                    frame = await asyncio.wait_for(queue.get(), timeout=self.keepalive)
+                except asyncio.TimeoutError:
+                    frame = b": keepalive\n\n"
+                yield frame
+        finally:
+            self.unsubscribe(queue)
+
+    def stats(self):
+        return {
+            "subscribers": len(self.subscribers),
+            "frames_sent": self.frames_sent,
+            "dropped": self.dropped,
+        }
@@ -0,0 +1,78 @@
+import os
+import re
+import threading
+import time
+from functools import lru_cache
+
+LOGOS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'public', 'logos')
+DEFAULT_LOGO = "/logoreal.png"
+
+# Same normalization download_logos.js uses when saving files
+SAFE_NAME_RE = re.compile(r'[^a-zA-Z0-9]')
+
+# Stat the directory at most this often (new logos show up within this delay)
+RECHECK_SECONDS = 30
+
+
+class LogoResolver:
+    """
+    Team name -> /logos/... URL. The logos directory is listed once into a
+    set and re-listed only when its mtime changes; names are memoized in a
+    bounded LRU, so a lookup is a dict hit instead of regex + os.path.exists.
+    """
+
+    def __init__(self, logos_dir=LOGOS_DIR, cache_size=4096, recheck=RECHECK_SECONDS):
+        self.logos_dir = logos_dir
+        self.recheck = recheck
+        self._files = frozenset()
+        self._mtime = None
+        self._checked_at = 0
+        self._lock = threading.Lock()
+        self._lookup = lru_cache(maxsize=cache_size)(self._resolve)
+
+    def _refresh_if_changed(self):
+        now = time.time()
+        if now - self._checked_at < self.recheck:
+            return
+        with self._lock:
+            if now - self._checked_at < self.recheck:
+                return
+            self._checked_at = now
+            try:
+                mtime = os.stat(self.logos_dir).st_mtime_ns
+            except OSError:
+                mtime = None
+            if mtime == self._mtime:
+                return
+            try:
+                files = frozenset(os.listdir(self.logos_dir)) if mtime is not None else frozenset()
+            except OSError:
+                files = frozenset()
+            self._files = files
+            self._mtime = mtime
+            self._lookup.cache_clear()
+
+    def _resolve(self, team_name):
+        safe_name = SAFE_NAME_RE.sub('_', team_name).lower() + ".png"
+        if safe_name in self._files:
+            return f"/logos/{safe_name}"
+        return DEFAULT_LOGO
+
+    def logo_url(self, team_name):
+        """URL of the team's local logo, or the default logo."""
+        if not team_name:
+            return DEFAULT_LOGO
+        self._refresh_if_changed()
+        return self._lookup(team_name)
+
+    def stats(self):
+        info = self._lookup.cache_info()
+        return {"files": len(self._files), "hits": info.hits, "misses": info.misses, "cached": info.currsize}
+
+
+# Shared by every scraper module
+logo_resolver = LogoResolver()
+
+
+def get_logo_url(team_name):
+    return logo_resolver.logo_url(team_name)
@@ -1,18 +1,18 @@
-import difflib
-import json
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from scraper import scrape_tonybet
-from prematch_scraper import scrape_tonybet_prematch
-from scraper_fast import scrape_tonybet_fast
-from scrapper_oriol import scrape_tonybet_oriol # [NEW IMPORT]
-from scraper_365scores import scrape_365scores
+from stats_store import stats_store
+from snapshots import SnapshotStore, SnapshotIndex, SourceState, snapshot_response
+from live_push import Broadcaster
+from browser_pool import browser_pool
+from scheduler import Scheduler
+from job_runner import JobRunner
+from cadence import LiveCadence, BUSY_INTERVAL, IDLE_INTERVAL
 import uvicorn
 import threading
 import time
 import os
-import subprocess
 import re
 
 app = FastAPI()
@@ -35,95 +35,68 @@ app.mount("/debug", StaticFiles(directory="."), name="debug")
 
 @app.get("/")
 def read_root():
-    return {"message": "Betly API is running", "endpoints": ["/api/odds", "/api/prematch-odds", "/api/fast-odds", "/api/oriol-odds"]}
+    return {"message": "Betly API is running", "endpoints": ["/api/odds", "/api/prematch-odds", "/api/fast-odds", "/api/fast-odds/changes", "/api/oriol-odds", "/api/oriol-odds/{league}", "/api/oriol-odds/{league}/{id2}", "/api/stream", "/api/scheduler"]}
 
 @app.get("/favicon.ico")
 def favicon():
     return {"message": "No favicon"}
 
-# Global cache to store matches
-matches_cache = []
-cache_lock = threading.Lock()
-is_scraping = False
+# Raw scraper output per source: one immutable SourceState per source, replaced
+# (never mutated) by that source's job, so publishers read it without locks.
+# Endpoints only ever read the published snapshots.
+
+# Live cache
+live_state = SourceState()
+live_snapshots = SnapshotStore("live", {"matches": [], "count": 0, "status": "ready"})
 
 # Prematch Cache
-prematch_cache = []
-prematch_lock = threading.Lock()
-is_scraping_prematch = False
+prematch_state = SourceState()
+prematch_snapshots = SnapshotStore("prematch", {"matches": [], "count": 0, "status": "ready"})
 
 # Fast Live Cache
-fast_cache = []
-fast_lock = threading.Lock()
-is_scraping_fast = False
+fast_state = SourceState()
+# Merged fast + 365 stats payload, rebuilt only when either source changes
+# Keeps the last 40 versions for /api/fast-odds/changes (~20 min at the 30s busy
+# cadence, longer when the adaptive interval backs off). start_time is stamped with
+# datetime.now() on every scrape, so it is not treated as a real change.
+fast_snapshots = SnapshotStore(
+    "fast", {"matches": [], "count": 0, "status": "ready"},
+    key="id", history=40, ignore_fields=("start_time",)
+)
+# Fast and 365 jobs both publish the merge; this only orders those two writers
+fast_publish_lock = threading.Lock()
 
 # [NEW] Oriol Cache
-oriol_cache = []
-oriol_lock = threading.Lock()
-is_scraping_oriol = False
-
-# --- STATS UNIFIER ---
-STATS_FILE = "365scores_live.json"
-stats_cache = []
-last_stats_update = 0
+oriol_state = SourceState()
+oriol_snapshots = SnapshotStore("oriol", {"matches": [], "count": 0, "status": "ready"}, key="id")
+# League slug -> matches and (league slug, id2) -> match of the current oriol snapshot
+oriol_index = SnapshotIndex()
 
-def load_365_stats():
-    global stats_cache, last_stats_update
-    try:
-        if os.path.exists(STATS_FILE):
-            # Check modification time to reload
-            mtime = os.path.getmtime(STATS_FILE)
-            if mtime > last_stats_update:
-                with open(STATS_FILE, 'r', encoding='utf-8') as f:
-                    stats_cache = json.load(f)
-                last_stats_update = mtime
-                # print(f"[Stats] Loaded {len(stats_cache)} stats records.")
-    except Exception as e:
-        print(f"[Stats] Error loading stats: {e}")
+# SSE push channel: every new fast/oriol version is pushed as a per-match delta.
+# 365 stats changes reach clients through the fast snapshot they are merged into.
+live_push = Broadcaster()
+fast_snapshots.on_publish(lambda prev, snap: live_push.publish_changes("fast", fast_snapshots, prev, snap))
+oriol_snapshots.on_publish(lambda prev, snap: live_push.publish_changes("oriol", oriol_snapshots, prev, snap))
 
-def normalize_name(name):
-    if not name: return ""
-    name = name.lower()
-    # Remove common suffixes/prefixes
-    replacements = [" fc", "fc ", "fk ", " u21", " u20", " u19", "ca ", " cd", "cf ", " sc", " women", " (w)"]
-    for r in replacements:
-        name = name.replace(r, "")
-    return name.strip()
+# --- STATS UNIFIER ---
+# 365Scores stats live in stats_store (published by the 365 job, see run_365_cycle)
 
 def merge_stats_with_fast(matches):
-    # Ensure fresh stats
-    load_365_stats()
+    # Latest published stats + their prebuilt name index (no file polling)
+    stats = stats_store.current()
     
-    if not stats_cache:
+    if not stats.records:
         return matches
 
     for m in matches:
         # Match Logic:
-        # 1. Match BOTH Home and Away names
-        # 2. Avg score must be high (> 0.60)
-        
-        home_fast = normalize_name(m.get('home_team', ''))
-        away_fast = normalize_name(m.get('away_team', ''))
-        
-        best_score = 0
-        best_match = None
-        
-        for s in stats_cache:
-            home_365 = normalize_name(s.get('homeTeam', ''))
-            away_365 = normalize_name(s.get('awayTeam', ''))
-            
-            # Use SequenceMatcher for both
-            ratio_home = difflib.SequenceMatcher(None, home_fast, home_365).ratio()
-            ratio_away = difflib.SequenceMatcher(None, away_fast, away_365).ratio()
-            
-            avg_ratio = (ratio_home + ratio_away) / 2
-            
-            if avg_ratio > best_score:
-                best_score = avg_ratio
-                best_match = s
-        
+        # 1. Match BOTH Home and Away names (trigram index narrows candidates)
+        # 2. Avg difflib score must be high (> 0.65)
         # Threshold - Needs to be reasonably high to avoid false positives (e.g. U19 vs Main)
         # But flexible enough for "Man City" vs "Manchester City"
-        if best_score > 0.65: 
+        best_match, best_score = stats.index.best_match(m.get('home_team', ''), m.get('away_team', ''))
+
+        if best_match:
             m['stats_365'] = best_match['stats']
             # print(f"Matched {m['home_team']} vs {m['away_team']} <-> {best_match['homeTeam']} vs {best_match['awayTeam']} ({best_score:.2f})")
         else:
@@ -131,160 +104,275 @@ def merge_stats_with_fast(matches):
             
     return matches
 
+def publish_fast_snapshot():
+    """
+    Merges the fast cache with the latest 365 stats and publishes the result.
+    Called once per fast/365 scrape cycle instead of on every /api/fast-odds hit.
+    """
+    with fast_publish_lock:
+        state = fast_state
+        # Copy each match so the merge never touches the raw cache entries
+        matches_copy = [dict(m) for m in state.matches]
+        scraping = state.scraping
 
-def background_scraper():
-    global matches_cache, is_scraping
-    while True:
-        try:
-            print("\n[Background] Starting new scrape cycle...")
-            is_scraping = True
-            start_time = time.time()
-            
-            # Run the scraper
-            new_data = scrape_tonybet()
-            
-            # Update cache if we got data
-            if new_data:
-                with cache_lock:
-                    matches_cache = new_data
-                print(f"[Background] Cache updated with {len(new_data)} matches.")
-            else:
-                print("[Background] No data found in this cycle.")
-                
-            duration = time.time() - start_time
-            print(f"[Background] Cycle finished in {duration:.2f} seconds.")
-            
-        except Exception as e:
-            print(f"[Background] Error in scraper loop: {e}")
-        finally:
-            is_scraping = False
-            
-        # Wait 1 hour before next update
-        print("[Background] Waiting 1 hour before next update...")
-        time.sleep(3600)
-
-def background_scraper_prematch():
-    global prematch_cache, is_scraping_prematch
-    while True:
-        try:
-            print("\n[Background Prematch] Starting new scrape cycle...")
-            is_scraping_prematch = True
-            start_time = time.time()
-            
-            # Run the scraper
-            new_data = scrape_tonybet_prematch()
-            
-            # Update cache if we got data
-            if new_data:
-                with prematch_lock:
-                    prematch_cache = new_data
-                print(f"[Background Prematch] Cache updated with {len(new_data)} matches.")
-            else:
-                print("[Background Prematch] No data found in this cycle.")
-                
-            duration = time.time() - start_time
-            print(f"[Background Prematch] Cycle finished in {duration:.2f} seconds.")
-            
-        except Exception as e:
-            print(f"[Background Prematch] Error in scraper loop: {e}")
-        finally:
-            is_scraping_prematch = False
-            
-        # Wait 4 hours before next update (less frequent)
-        print("[Background Prematch] Waiting 4 hours before next update...")
-        time.sleep(14400)
-
-def background_scraper_fast():
-    global fast_cache, is_scraping_fast
-    while True:
-        try:
-            print("\n[Background Fast] Starting new scrape cycle...")
-            is_scraping_fast = True
-            start_time = time.time()
-            
-            # Run the scraper
-            new_data = scrape_tonybet_fast()
-            
-            # Update cache if we got data
-            if new_data:
-                with fast_lock:
-                    fast_cache = new_data
-                print(f"[Background Fast] Cache updated with {len(new_data)} matches.")
-                
-                # Trigger 365scores scraper update too? 
-                # Ideally yes, but let's keep it decoupled for now.
-                
-            else:
-                print("[Background Fast] No data found in this cycle.")
-                
-            duration = time.time() - start_time
-            print(f"[Background Fast] Cycle finished in {duration:.2f} seconds.")
-            
-        except Exception as e:
-            print(f"[Background Fast] Error in scraper loop: {e}")
-        finally:
-            is_scraping_fast = False
-            
-        # Wait 10 minutes before next update (CPU friendly)
-        print("[Background Fast] Waiting 2 minutes before next update...")
-        time.sleep(120)
-
-# [NEW] Background Scraper Oriol
-def background_scraper_oriol():
-    global oriol_cache, is_scraping_oriol
-    while True:
-        try:
-            print("\n[Background Oriol] Starting new scrape cycle (FULL ODDS)...")
-            is_scraping_oriol = True
-            start_time = time.time()
-            
-            # Run the scraper
-            new_data = scrape_tonybet_oriol()
-            
-            # Update cache if we got data
-            if new_data:
-                with oriol_lock:
-                    oriol_cache = new_data
-                print(f"[Background Oriol] Cache updated with {len(new_data)} matches.")
-            else:
-                print("[Background Oriol] No data found in this cycle.")
-                
-            duration = time.time() - start_time
-            print(f"[Background Oriol] Cycle finished in {duration:.2f} seconds.")
-            
-        except Exception as e:
-            print(f"[Background Oriol] Error in scraper loop: {e}")
-        finally:
-            is_scraping_oriol = False
+        matches_merged = merge_stats_with_fast(matches_copy)
+
+        return fast_snapshots.publish({
+            "matches": matches_merged,
+            "count": len(matches_merged),
+            "status": "scraping" if scraping and not matches_merged else "ready"
+        })
+
+# One reference read gives matches + flag that belong together (no lock needed)
+def publish_live_snapshot():
+    state = live_state
+    matches, scraping = list(state.matches), state.scraping
+    return live_snapshots.publish({
+        "matches": matches,
+        "count": len(matches),
+        "status": "scraping" if scraping and not matches else "ready"
+    })
+
+def publish_prematch_snapshot():
+    state = prematch_state
+    matches, scraping = list(state.matches), state.scraping
+    return prematch_snapshots.publish({
+        "matches": matches,
+        "count": len(matches),
+        "status": "scraping" if scraping and not matches else "ready"
+    })
+
+def oriol_league_name(match):
+    # Use league_header name if available, else tournament name
+    if match.get('league_header') and match['league_header'].get('name'):
+        return match['league_header']['name']
+    if match.get('tournament') and match['tournament'].get('name'):
+        return match['tournament']['name']
+    return ""
+
+def league_slug(name):
+    # Same slug the frontend builds for /marketing/<league>/<id2>/... links
+    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-') or "league"
+
+def publish_oriol_snapshot():
+    global oriol_index
+    state = oriol_state
+    matches, scraping = state.matches, state.scraping
+
+    # Inject sequential ID2 PER LEAGUE for URL routing (1, 2, 3... for EACH league)
+    # and index the matches by league slug, once per publish instead of per request
+    matches_with_id = []
+    league_counters = {}
+    leagues = {}
+    items = {}
+
+    for match in matches:
+        m_copy = match.copy()
+
+        league_name = oriol_league_name(m_copy)
+        league_key = (league_name or "unknown").strip().lower()
+        league_counters[league_key] = league_counters.get(league_key, 0) + 1
+        m_copy['id2'] = league_counters[league_key]
+
+        slug = league_slug(league_name)
+        leagues.setdefault(slug, []).append(m_copy)
+        # Two league names can share a slug; the first match wins, like the old page lookup
+        items.setdefault((slug, m_copy['id2']), m_copy)
+
+        matches_with_id.append(m_copy)
+
+    status = "scraping" if scraping and not matches else "ready"
+    snapshot = oriol_snapshots.publish({
+        "matches": matches_with_id,
+        "count": len(matches_with_id),
+        "status": status
+    })
+    # Unchanged content keeps the old version, and its index with it
+    if snapshot.version != oriol_index.version:
+        oriol_index = SnapshotIndex(snapshot.version, status, leagues, items, group_field="league")
+    return snapshot
+
+
+# Seconds between job starts (fixed rate, +/-10% jitter); SCHEDULE_<JOB>=seconds overrides
+JOB_INTERVALS = {
+    "fast": 120,
+    "365": 120,
+    "live": 3600,
+    "oriol": 8000,
+    "prematch": 14400,
+}
+# SCHEDULE_<JOB>=seconds overrides an interval. For fast/365 it also turns the
+# adaptive cadence off (fixed interval), see on_startup.
+SCHEDULE_OVERRIDES = {name for name in JOB_INTERVALS if os.getenv(f"SCHEDULE_{name.upper()}")}
+for _job_name in SCHEDULE_OVERRIDES:
+    JOB_INTERVALS[_job_name] = int(os.getenv(f"SCHEDULE_{_job_name.upper()}"))
+
+scheduler = Scheduler(rss_fn=browser_pool.chromium_rss_mb)
+
+# Scrapers run in supervised worker processes (SCRAPER_ISOLATION=thread for the old
+# in-process behaviour): parsing never holds the API's GIL and a hung Chromium is killed
+# after its timeout instead of taking the API down. SCRAPER_TIMEOUT_<JOB>=seconds overrides.
+JOB_TIMEOUTS = {
+    "fast": 300,
+    "365": 300,
+    "live": 1800,
+    "oriol": 900,
+    "prematch": 1800,
+}
+for _job_name in JOB_TIMEOUTS:
+    JOB_TIMEOUTS[_job_name] = int(os.getenv(f"SCRAPER_TIMEOUT_{_job_name.upper()}", JOB_TIMEOUTS[_job_name]))
+
+job_runner = JobRunner()
+job_runner.add("fast", "scraper_fast:scrape_tonybet_fast", JOB_TIMEOUTS["fast"])
+# The worker's own stats_store must not write the snapshot file; this process publishes it
+job_runner.add("365", "scraper_365scores:scrape_365scores", JOB_TIMEOUTS["365"], env={"STATS_365_PERSIST": "0"})
+job_runner.add("live", "scraper:scrape_tonybet", JOB_TIMEOUTS["live"])
+job_runner.add("oriol", "scrapper_oriol:scrape_tonybet_oriol", JOB_TIMEOUTS["oriol"])
+job_runner.add("prematch", "prematch_scraper:scrape_tonybet_prematch", JOB_TIMEOUTS["prematch"])
+
+# fast/365 intervals follow the live slate: ~30s when busy or odds move, minutes when idle
+live_cadence = LiveCadence()
+
+
+def run_live_cycle():
+    global live_state
+    try:
+        print("\n[Background] Starting new scrape cycle...")
+        live_state = live_state.replace(scraping=True)
+        publish_live_snapshot()
+        start_time = time.time()
+        
+        # Run the scraper
+        new_data = job_runner.run("live")
+        
+        # Update cache if we got data
+        if new_data:
+            live_state = live_state.replace(matches=new_data)
+            print(f"[Background] Cache updated with {len(new_data)} matches.")
+        else:
+            print("[Background] No data found in this cycle.")
             
-        # Wait 2 minutes before next update
-        print("[Background Oriol] Waiting 8000 seconds before next update...")
-        time.sleep(8000)
-
-def background_scraper_365():
-    global is_scraping_365
-    while True:
-        try:
-            print("\n[Background 365] Starting new scrape cycle...")
-            is_scraping_365 = True
-            start_time = time.time()
+        duration = time.time() - start_time
+        print(f"[Background] Cycle finished in {duration:.2f} seconds.")
+        
+    except Exception as e:
+        print(f"[Background] Error in scraper loop: {e}")
+        raise  # Counted as a failure by the scheduler
+    finally:
+        live_state = live_state.replace(scraping=False)
+        publish_live_snapshot()
+
+def run_prematch_cycle():
+    global prematch_state
+    try:
+        print("\n[Background Prematch] Starting new scrape cycle...")
+        prematch_state = prematch_state.replace(scraping=True)
+        publish_prematch_snapshot()
+        start_time = time.time()
+        
+        # Run the scraper
+        new_data = job_runner.run("prematch")
+        
+        # Update cache if we got data
+        if new_data:
+            prematch_state = prematch_state.replace(matches=new_data)
+            print(f"[Background Prematch] Cache updated with {len(new_data)} matches.")
+        else:
+            print("[Background Prematch] No data found in this cycle.")
             
-            # Run the scraper
-            scrape_365scores()
+        duration = time.time() - start_time
+        print(f"[Background Prematch] Cycle finished in {duration:.2f} seconds.")
+        
+    except Exception as e:
+        print(f"[Background Prematch] Error in scraper loop: {e}")
+        raise  # Counted as a failure by the scheduler
+    finally:
+        prematch_state = prematch_state.replace(scraping=False)
+        publish_prematch_snapshot()
+
+def run_fast_cycle():
+    global fast_state
+    try:
+        print("\n[Background Fast] Starting new scrape cycle...")
+        fast_state = fast_state.replace(scraping=True)
+        publish_fast_snapshot()
+        start_time = time.time()
+        
+        # Run the scraper
+        new_data = job_runner.run("fast")
+        
+        # Update cache if we got data
+        # An empty cycle counts too: no live events -> back off
+        live_cadence.observe(fast_state.matches, new_data)
+
+        if new_data:
+            fast_state = fast_state.replace(matches=new_data)
+            print(f"[Background Fast] Cache updated with {len(new_data)} matches.")
             
-            # Trigger reload in memory logic implicitly by updating file timestamp
+            # Trigger 365scores scraper update too? 
+            # Ideally yes, but let's keep it decoupled for now.
             
-            duration = time.time() - start_time
-            print(f"[Background 365] Cycle finished in {duration:.2f} seconds.")
+        else:
+            print("[Background Fast] No data found in this cycle.")
             
-        except Exception as e:
-            print(f"[Background 365] Error in scraper loop: {e}")
-        finally:
-            is_scraping_365 = False
+        duration = time.time() - start_time
+        print(f"[Background Fast] Cycle finished in {duration:.2f} seconds.")
+        
+    except Exception as e:
+        print(f"[Background Fast] Error in scraper loop: {e}")
+        raise  # Counted as a failure by the scheduler
+    finally:
+        fast_state = fast_state.replace(scraping=False)
+        publish_fast_snapshot()
+
+def run_oriol_cycle():
+    global oriol_state
+    try:
+        print("\n[Background Oriol] Starting new scrape cycle (FULL ODDS)...")
+        oriol_state = oriol_state.replace(scraping=True)
+        publish_oriol_snapshot()
+        start_time = time.time()
+        
+        # Run the scraper
+        new_data = job_runner.run("oriol")
+        
+        # Update cache if we got data
+        if new_data:
+            oriol_state = oriol_state.replace(matches=new_data)
+            print(f"[Background Oriol] Cache updated with {len(new_data)} matches.")
+        else:
+            print("[Background Oriol] No data found in this cycle.")
             
-        # Wait 30 seconds (Live stats need to be kinda fresh)
-        print("[Background 365] Waiting 2 minutes before next update...")
-        time.sleep(120)
+        duration = time.time() - start_time
+        print(f"[Background Oriol] Cycle finished in {duration:.2f} seconds.")
+        
+    except Exception as e:
+        print(f"[Background Oriol] Error in scraper loop: {e}")
+        raise  # Counted as a failure by the scheduler
+    finally:
+        oriol_state = oriol_state.replace(scraping=False)
+        publish_oriol_snapshot()
+
+def run_365_cycle():
+    try:
+        print("\n[Background 365] Starting new scrape cycle...")
+        start_time = time.time()
+        
+        # Run the scraper
+        results = job_runner.run("365")
+        if job_runner.isolated:
+            # Published inside the worker process only; make it visible here
+            stats_store.publish(results)
+        
+        # Re-merge the fast snapshot with the freshly published stats
+        publish_fast_snapshot()
+        
+        duration = time.time() - start_time
+        print(f"[Background 365] Cycle finished in {duration:.2f} seconds.")
+        
+    except Exception as e:
+        print(f"[Background 365] Error in scraper loop: {e}")
+        raise  # Counted as a failure by the scheduler
 
 
 @app.on_event("startup")
@@ -302,109 +390,116 @@ def startup_event():
         print(f"Path: {route.path}")
     print("-------------------------")
 
-    if scraper_mode in ["LIVE", "BOTH", "ALL"]:
-        # Start the scraper in a background thread
-        thread = threading.Thread(target=background_scraper, daemon=True)
-        thread.start()
-        print("Live scraper background thread started.")
-    
-    if scraper_mode in ["PREMATCH", "BOTH", "ALL"]:
-        # Start the prematch scraper in a separate background thread
-        thread_prematch = threading.Thread(target=background_scraper_prematch, daemon=True)
-        thread_prematch.start()
-        print("Prematch scraper background thread started.")
+    # Warm restart: reuse the last persisted stats so the first requests get a merged view
+    stats_store.load_from_disk()
+    publish_fast_snapshot()
 
+    # One scheduler instead of a while/sleep thread per scraper.
+    # Priority: lower runs first when jobs compete for a slot (live data before prematch).
     if scraper_mode in ["FAST", "ALL", "FAST_ORIOL"]:
-        # Start the fast scraper in a separate background thread
-        thread_fast = threading.Thread(target=background_scraper_fast, daemon=True)
-        thread_fast.start()
-        print("Fast scraper background thread started.")
-        
-        # Start 365 scraper alongside FAST (or independently if we had a flag)
-        # Assuming FAST mode wants stats too.
-        thread_365 = threading.Thread(target=background_scraper_365, daemon=True)
-        thread_365.start()
-        print("365Scores scraper background thread started.")
-    
-    # [NEW] STart Oriol Scraper if mode is ALL or ORIOL or FAST_ORIOL
+        # Adaptive: interval comes from live_cadence (in-play count, odds volatility),
+        # unless SCHEDULE_FAST / SCHEDULE_365 pins a fixed interval
+        adaptive = {"interval_fn": live_cadence.interval, "min_interval": BUSY_INTERVAL, "max_interval": IDLE_INTERVAL}
+        scheduler.add("fast", run_fast_cycle, JOB_INTERVALS["fast"], priority=0,
+                      **({} if "fast" in SCHEDULE_OVERRIDES else adaptive))
+        # 365 stats ride along with FAST (merged into /api/fast-odds)
+        scheduler.add("365", run_365_cycle, JOB_INTERVALS["365"], priority=1,
+                      **({} if "365" in SCHEDULE_OVERRIDES else adaptive))
+
+    if scraper_mode in ["LIVE", "BOTH", "ALL"]:
+        scheduler.add("live", run_live_cycle, JOB_INTERVALS["live"], priority=2)
+
     if scraper_mode in ["ALL", "ORIOL", "FAST_ORIOL"]:
-        thread_oriol = threading.Thread(target=background_scraper_oriol, daemon=True)
-        thread_oriol.start()
-        print("Oriol scraper (Full Odds) background thread started.")
+        scheduler.add("oriol", run_oriol_cycle, JOB_INTERVALS["oriol"], priority=3)
+
+    if scraper_mode in ["PREMATCH", "BOTH", "ALL"]:
+        scheduler.add("prematch", run_prematch_cycle, JOB_INTERVALS["prematch"], priority=4)
+
+    scheduler.start()
+
+@app.on_event("shutdown")
+def shutdown_event():
+    # Don't leave worker processes (and their Chromium) behind
+    job_runner.stop()
 
+# All odds endpoints serve pre-serialized (and pre-compressed) snapshots with ETags
 @app.get("/api/odds")
-def get_odds():
-    with cache_lock:
-        # Return cached data immediately
-        # Also return a status flag so frontend knows if it's fresh or initial loading
-        return {
-            "matches": matches_cache,
-            "count": len(matches_cache),
-            "status": "scraping" if is_scraping and not matches_cache else "ready"
-        }
+def get_odds(request: Request):
+    return snapshot_response(live_snapshots.current(), request)
 
 @app.get("/api/prematch-odds")
-def get_prematch_odds():
-    with prematch_lock:
-        return {
-            "matches": prematch_cache,
-            "count": len(prematch_cache),
-            "status": "scraping" if is_scraping_prematch and not prematch_cache else "ready"
-        }
+def get_prematch_odds(request: Request):
+    return snapshot_response(prematch_snapshots.current(), request)
 
 @app.get("/api/fast-odds")
-def get_fast_odds():
-    with fast_lock:
-        # Create a copy to avoid modifying cache in place or race conditions
-        # although verifying file existence is fast, better to do it on the fly
-        matches_copy = list(fast_cache)
-        
-        # MERGE STATS
-        matches_merged = merge_stats_with_fast(matches_copy)
-        
-        return {
-            "matches": matches_merged,
-            "count": len(matches_merged),
-            "status": "scraping" if is_scraping_fast and not fast_cache else "ready"
-        }
+def get_fast_odds(request: Request):
+    # Pre-merged fast + 365 stats (see publish_fast_snapshot)
+    return snapshot_response(fast_snapshots.current(), request)
+
+@app.get("/api/fast-odds/changes")
+def get_fast_odds_changes(since: int = None):
+    # Only the matches added/changed/removed since the client's version.
+    # Unknown or too-old versions get the full list back ("full": true).
+    body = fast_snapshots.changes_since(since)
+    return Response(content=body, media_type="application/json", headers={"Cache-Control": "no-cache"})
+
+@app.get("/api/stream")
+async def stream_updates():
+    # Server-Sent Events: hello with current versions, then fast/oriol deltas.
+    # After a reconnect, resync with /api/fast-odds/changes?since=<last version>.
+    # Event ids are "<source>-<version>" (e.g. fast-12).
+    def hello():
+        return {"fast": fast_snapshots.version, "oriol": oriol_snapshots.version}
+    return StreamingResponse(
+        live_push.stream(hello),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/api/stream/stats")
+def stream_stats():
+    return live_push.stats()
+
+@app.get("/api/scheduler")
+def scheduler_info():
+    # Per job: next run, last duration, failures, skips; plus concurrency/memory budget state
+    info = scheduler.info()
+    info["live_cadence"] = live_cadence.info()
+    info["workers"] = job_runner.info()
+    return info
+
+@app.get("/api/browser-pool")
+def browser_pool_stats():
+    # Launch/recycle counters and Chromium memory for the shared browser pool.
+    # With isolated jobs the pools live in the workers, which report their
+    # counters back after every run; Chromium RSS is measured from here (all descendants).
+    if not job_runner.isolated:
+        return browser_pool.stats()
+    stats = job_runner.browser_stats()
+    stats["chromium_rss_mb"] = browser_pool.chromium_rss_mb()
+    return stats
 
 # [NEW] Endpoint for Oriol Odds
 @app.get("/api/oriol-odds")
-def get_oriol_odds():
-    with oriol_lock:
-        # Inject sequential ID2 PER LEAGUE for URL routing (1, 2, 3... for EACH league)
-        matches_with_id = []
-        league_counters = {}
-
-        for match in oriol_cache:
-            m_copy = match.copy()
-            
-            # Determine League Key (Consistency is key)
-            # Use league_header name if available, else tournament name
-            league_name = "unknown"
-            if m_copy.get('league_header') and m_copy['league_header'].get('name'):
-                 league_name = m_copy['league_header']['name']
-            elif m_copy.get('tournament') and m_copy['tournament'].get('name'):
-                 league_name = m_copy['tournament']['name']
-            
-            # Normalize for key usage (optional but safer)
-            league_key = league_name.strip().lower() # Simple normalization
-
-            # Initialize counter if new league
-            if league_key not in league_counters:
-                league_counters[league_key] = 1
-            
-            # Assign ID and increment
-            m_copy['id2'] = league_counters[league_key]
-            league_counters[league_key] += 1
-            
-            matches_with_id.append(m_copy)
-
-        return {
-            "matches": matches_with_id,
-            "count": len(matches_with_id),
-            "status": "scraping" if is_scraping_oriol and not oriol_cache else "ready"
-        }
+def get_oriol_odds(request: Request):
+    # id2 per league is assigned once at publish time (see publish_oriol_snapshot)
+    return snapshot_response(oriol_snapshots.current(), request)
+
+@app.get("/api/oriol-odds/{league}")
+def get_oriol_league(league: str, request: Request):
+    # One league (by the same slug the marketing links use)
+    snapshot = oriol_index.group(league)
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail=f"League {league} not found")
+    return snapshot_response(snapshot, request)
+
+@app.get("/api/oriol-odds/{league}/{id2}")
+def get_oriol_match(league: str, id2: int, request: Request):
+    # Single match for /marketing/<league>/<id2>/<riskLevel>
+    snapshot = oriol_index.item(league, id2)
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail=f"Match {id2} not found in {league}")
+    return snapshot_response(snapshot, request)
 
 if __name__ == "__main__":
     # Use 0.0.0.0 to make it accessible externally (e.g. on a VPS)
@@ -0,0 +1,92 @@
+import re
+from functools import lru_cache
+
+# Total goals market in relations.odds and its outcome ids
+TOTAL_GOALS_MARKET = 18
+OVER_OUTCOME = "12"
+UNDER_OUTCOME = "13"
+
+TOTAL_RE = re.compile(r'total=([0-9.]+)')
+
+# Same line offered twice in one match's markets (later one kept), since start
+duplicate_lines = 0
+
+# Lines the frontend reads as fixed keys (always present, None when not offered)
+LEGACY_LINES = (0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 3.5, 4.0, 4.5, 5.0, 5.5, 6.0, 6.5, 7.0, 7.5, 8.0, 8.5)
+# Historical names for two of them
+LEGACY_OVERRIDES = {3.5: "combined_odds_3_5", 4.5: "combined_odds_4_5"}
+
+
+def legacy_key(line):
+    """2.5 -> over_2_5_odds, 3.0 -> over_3_odds, 3.5 -> combined_odds_3_5."""
+    if line in LEGACY_OVERRIDES:
+        return LEGACY_OVERRIDES[line]
+    if line == int(line):
+        return f"over_{int(line)}_odds"
+    return f"over_{str(line).replace('.', '_')}_odds"
+
+
+LEGACY_KEYS = {line: legacy_key(line) for line in LEGACY_LINES}
+
+
+@lru_cache(maxsize=1024)
+def parse_total(specifiers):
+    """'total=2.5' -> 2.5 (None if absent). Same few strings every cycle, so cached."""
+    match = TOTAL_RE.search(specifiers or "")
+    if not match:
+        return None
+    try:
+        return float(match.group(1))
+    except ValueError:
+        return None
+
+
+def decode_ladder(markets):
+    """
+    Total goals ladder of one match: sorted [(line, over, under), ...] for
+    every line offered (under is None if missing).
+
+    The feed can list the same total in more than one market. They are merged
+    field by field: a later over/under replaces an earlier one, but a missing
+    one never clears it (the old elif chain only wrote a line when the market
+    had an Over). duplicate_lines counts them.
+    """
+    global duplicate_lines
+    ladder = {}
+    for market in markets or []:
+        if market.get("vendorMarketId") != TOTAL_GOALS_MARKET:
+            continue
+        line = parse_total(market.get("specifiers"))
+        if line is None:
+            continue
+
+        over = under = None
+        for out in market.get("outcomes", []):
+            outcome_id = str(out.get("vendorOutcomeId"))
+            if outcome_id == OVER_OUTCOME:
+                over = out.get("odds")
+            elif outcome_id == UNDER_OUTCOME:
+                under = out.get("odds")
+        if over or under:
+            if line in ladder:
+                duplicate_lines += 1
+                _, old_over, old_under = ladder[line]
+                over = over or old_over
+                under = under or old_under
+            ladder[line] = (line, over, under)
+    return [ladder[line] for line in sorted(ladder)]
+
+
+def decode_ladders(odds_cache):
+    """Bulk decode for a whole cycle: match id -> ladder."""
+    return {str(match_id): decode_ladder(markets) for match_id, markets in odds_cache.items()}
+
+
+def legacy_odds(ladder):
+    """Fixed over_X_odds keys derived from a ladder (None where the line is not offered)."""
+    odds = dict.fromkeys(LEGACY_KEYS.values())
+    for line, over, _ in ladder:
+        key = LEGACY_KEYS.get(line)
+        if key and over:
+            odds[key] = over
+    return odds
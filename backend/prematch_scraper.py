@@ -1,36 +1,119 @@
 import re
-from playwright.sync_api import sync_playwright
-from bs4 import BeautifulSoup
+import unicodedata
+from browser_pool import browser_pool
+from scroll_driver import ScrollDriver
+from tonybet_api import tonybet_api, FETCH_MODE
+from odds_ladder import decode_ladder, legacy_odds
 import time
-import datetime
 
-def scrape_tonybet_prematch():
+PREMATCH_SITE_URL = "https://tonybet.com/cl/prematch/football"
+PREMATCH_API_HOST = "https://platform.tonybet.com"
+# Same event/list query the prematch page sends (status_in=0 = not started)
+PREMATCH_PARAMS = [
+    ("lang", "es"), ("relations", "odds"), ("relations", "league"), ("relations", "competitors"),
+    ("oddsExists_eq", "1"), ("main", "1"), ("period", "0"), ("sportId_eq", "1"),
+    ("status_in", "0"), ("isLive", "false"), ("countryCode", "CL"),
+]
+
+# Returns only complete rows not seen on a previous call. Processed rows are tagged with
+# data-scraped=<href> (href, not a flag, so recycled/virtualized nodes that now
+# show another match are picked up again). Text matches bs4 get_text(strip=True).
+EXTRACT_NEW_ROWS_JS = """() => {
+    const text = (el) => {
+        if (!el) return null;
+        const parts = [];
+        const walker = document.createTreeWalker(el, NodeFilter.SHOW_TEXT);
+        while (walker.nextNode()) {
+            const t = walker.currentNode.nodeValue.trim();
+            if (t) parts.push(t);
+        }
+        return parts.join("");
+    };
+
+    const rows = [];
+    for (const row of document.querySelectorAll('div[data-test="eventTableRow"]')) {
+        const link = row.querySelector('a[data-test="eventLink"]');
+        if (!link) continue;
+        const href = link.getAttribute('href');
+        if (row.dataset.scraped === href) continue;
+
+        // Over 2.5 lives in the market whose middle outcome is the line
+        let over25 = null;
+        for (const market of row.querySelectorAll('div[data-test="marketItem"]')) {
+            const outcomes = market.querySelectorAll('[data-test="outcome"]');
+            if (outcomes.length >= 3 && text(outcomes[1]) === "2.5") {
+                over25 = text(outcomes[2]);
+                break;
+            }
+        }
+
+        const teams = [...row.querySelectorAll('div[data-test="teamName"]')].map(el => text(el));
+        // Incomplete rows (odds not rendered yet) stay untagged and are retried next scroll
+        if (teams.length < 2 || !over25) continue;
+        row.dataset.scraped = href;
+
+        rows.push({
+            href: href,
+            event_date: text(row.querySelector('span[data-test="eventDate"]')),
+            event_time: text(row.querySelector('span[data-test="eventTime"]')),
+            teams: teams,
+            over_2_5: over25
+        });
+    }
+    return rows;
+}"""
+
+
+# /cl/prematch/football/1008007-laliga/7802786-osasuna-alaves -> 7802786
+EVENT_ID_RE = re.compile(r'/(\d+)-[^/]*/?$')
+
+
+def event_id_from_href(href):
+    """Tonybet event id from an event link (same id the API path uses); the href itself if it has none."""
+    match = EVENT_ID_RE.search(href or "")
+    return match.group(1) if match else href
+
+
+def build_prematch_match(row):
+    teams = row.get("teams") or []
+    if len(teams) < 2 or not row.get("over_2_5"):
+        return None
+
+    home_team, away_team = teams[0], teams[1]
+    event_date = row.get("event_date") or "Unknown"
+    event_time = row.get("event_time") or "Unknown"
+
+    return {
+        "id": event_id_from_href(row["href"]),
+        "league": "Prematch",
+        "home_team": home_team,
+        "away_team": away_team,
+        "teams": f"{home_team} vs {away_team}",
+        "url": f"https://tonybet.com{row['href']}",
+        "event_date": event_date,
+        "event_time": event_time,
+        "start_time": f"{event_date} {event_time}",
+        "over_2_5_odds": row["over_2_5"],
+        "competitors": {
+            "home": {"name": home_team, "logo": "/logoreal.png"},
+            "away": {"name": away_team, "logo": "/logoreal.png"}
+        }
+    }
+
+
+def scrape_tonybet_prematch_dom():
+    """Old DOM path (scroll + in-page extraction, Over 2.5 only). Kept as fallback."""
     matches_to_scrape = []
     scraped_ids = set()
     
-    with sync_playwright() as p:
-        launch_options = {
-            "headless": True,
-            "args": [
-                '--no-sandbox',
-                '--disable-setuid-sandbox',
-                '--disable-dev-shm-usage',
-                '--disable-blink-features=AutomationControlled'
-            ]
-        }
-        
-        browser = p.chromium.launch(**launch_options)
-        
-        page = browser.new_page(
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            viewport={"width": 1920, "height": 1080}
-        )
+    with browser_pool.lease("tonybet", block="prematch", viewport={"width": 1920, "height": 1080}) as context:
+        page = context.new_page()
         
         try:
             print("Navigating to Tonybet Prematch Football...")
             page.add_init_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
             
-            page.goto("https://tonybet.com/cl/prematch/football", timeout=60000)
+            page.goto(PREMATCH_SITE_URL, timeout=60000)
             
             # Wait for initial load
             try:
@@ -40,109 +123,136 @@ def scrape_tonybet_prematch():
 
             print("Starting scrape loop (Scroll & Parse)...")
             
-            no_change_count = 0
-            max_scrolls = 30
-            
-            for i in range(max_scrolls):
-                # 1. Parse visible content
-                content = page.content()
-                soup = BeautifulSoup(content, 'html.parser')
-                rows = soup.find_all('div', attrs={'data-test': 'eventTableRow'})
-                
+            parse_time = 0.0
+            rows_seen = 0
+
+            def collect_new_rows(i, count):
+                # Only rows added since the last scroll are extracted (linear overall)
+                nonlocal parse_time, rows_seen
+                t0 = time.time()
+                rows = page.evaluate(EXTRACT_NEW_ROWS_JS)
+                parse_time += time.time() - t0
+                rows_seen += len(rows)
+
                 new_in_this_scroll = 0
-                
                 for row in rows:
-                    try:
-                        link_el = row.find('a', attrs={'data-test': 'eventLink'})
-                        if not link_el: continue
-                        
-                        href = link_el.get('href')
-                        if href in scraped_ids:
-                            continue
-                        
-                        # Extract Data
-                        full_url = f"https://tonybet.com{href}"
-                        
-                        # Date/Time
-                        event_date = row.find('span', attrs={'data-test': 'eventDate'})
-                        event_date = event_date.get_text(strip=True) if event_date else "Unknown"
-                        
-                        event_time = row.find('span', attrs={'data-test': 'eventTime'})
-                        event_time = event_time.get_text(strip=True) if event_time else "Unknown"
-                        
-                        # Teams
-                        team_names = row.find_all('div', attrs={'data-test': 'teamName'})
-                        if len(team_names) >= 2:
-                            home_team = team_names[0].get_text(strip=True)
-                            away_team = team_names[1].get_text(strip=True)
-                        else:
-                            continue
-
-                        # Odds (Over 2.5)
-                        over_2_5_val = None
-                        market_items = row.find_all('div', attrs={'data-test': 'marketItem'})
-                        
-                        for market_item in market_items:
-                            outcomes = market_item.find_all(attrs={'data-test': 'outcome'})
-                            if len(outcomes) >= 3:
-                                line_val = outcomes[1].get_text(strip=True)
-                                if line_val == "2.5":
-                                    over_2_5_val = outcomes[2].get_text(strip=True)
-                                    break
-                        
-                        if over_2_5_val:
-                            match_data = {
-                                "id": abs(hash(href)),
-                                "league": "Prematch",
-                                "home_team": home_team,
-                                "away_team": away_team,
-                                "teams": f"{home_team} vs {away_team}",
-                                "url": full_url,
-                                "event_date": event_date,
-                                "event_time": event_time,
-                                "start_time": f"{event_date} {event_time}",
-                                "over_2_5_odds": over_2_5_val,
-                                "competitors": {
-                                    "home": {"name": home_team, "logo": "/logoreal.png"},
-                                    "away": {"name": away_team, "logo": "/logoreal.png"}
-                                }
-                            }
-                            matches_to_scrape.append(match_data)
-                            scraped_ids.add(href)
-                            new_in_this_scroll += 1
-                            print(f"[Match Found] {home_team} vs {away_team} | Over 2.5: {over_2_5_val}")
-                            
-                    except Exception as e:
+                    if row["href"] in scraped_ids:
+                        continue
+                    match_data = build_prematch_match(row)
+                    if not match_data:
                         continue
-                
-                print(f"Scroll {i+1}/{max_scrolls}: Found {new_in_this_scroll} new matches (Total: {len(matches_to_scrape)})")
-                
-                # 2. Scroll Logic
-                previous_height = page.evaluate("document.body.scrollHeight")
-                page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                time.sleep(2) # Wait for load
-                
-                current_height = page.evaluate("document.body.scrollHeight")
-                
-                if current_height == previous_height:
-                    no_change_count += 1
-                    # Try pressing End key to trigger lazy load
-                    page.keyboard.press("End")
-                    time.sleep(1)
-                else:
-                    no_change_count = 0
-                    
-                if no_change_count >= 3:
-                    print("No more content loading. Stopping.")
-                    break
+                    matches_to_scrape.append(match_data)
+                    scraped_ids.add(row["href"])
+                    new_in_this_scroll += 1
+                    print(f"[Match Found] {match_data['home_team']} vs {match_data['away_team']} | Over 2.5: {match_data['over_2_5_odds']}")
+
+                print(f"Scroll {i+1}/{scroller.max_scrolls}: Found {new_in_this_scroll} new matches (Total: {len(matches_to_scrape)})")
+
+            scroller = ScrollDriver(page, 'div[data-test="eventTableRow"]', max_scrolls=30, stable_rounds=3)
+            scroller.install()
+            collect_new_rows(-1, scroller.row_count())  # Rows from the initial render
+            scroller.scroll_to_end(on_scroll=collect_new_rows)
+
+            print(f"[Prematch] {rows_seen} rows extracted in {parse_time:.2f}s ({scroller.report()})")
             
         except Exception as e:
             print(f"Global error in prematch scraper: {e}")
         finally:
-            browser.close()
+            page.close()
             
     return matches_to_scrape
 
+def tonybet_slug(text):
+    """'Deportivo Alavés' -> 'deportivo-alaves' (how Tonybet slugs names in its URLs)."""
+    text = unicodedata.normalize("NFKD", text or "").encode("ascii", "ignore").decode("ascii")
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')
+
+
+def prematch_event_url(item, league, home, away):
+    """
+    Event page URL like the site's own links:
+    /cl/prematch/football/<leagueId>-<league slug>/<eventId>-<event slug>.
+    Uses the API's slug fields, falling back to slugged names; the list page
+    if the league is unknown.
+    """
+    league_id = league.get("id") or item.get("leagueId") or item.get("league")
+    league_slug = league.get("slug") or tonybet_slug(league.get("name"))
+    if not league_id or not league_slug:
+        return PREMATCH_SITE_URL
+    event_slug = item.get("slug") or tonybet_slug(f"{home} {away}")
+    return f"{PREMATCH_SITE_URL}/{league_id}-{league_slug}/{item.get('id')}-{event_slug}"
+
+
+def parse_prematch_response(json_data):
+    """Builds the prematch match list (same shape as the DOM path) from merged event/list pages."""
+    matches = []
+    data_root = (json_data or {}).get("data") or {}
+    relations = data_root.get("relations") or {}
+    odds_map = relations.get("odds") or {}
+
+    competitors_map = relations.get("competitors") or {}
+    if isinstance(competitors_map, list):
+        competitors_map = {str(c.get("id")): c for c in competitors_map}
+    leagues_map = relations.get("league") or {}
+    if isinstance(leagues_map, list):
+        leagues_map = {str(l.get("id")): l for l in leagues_map}
+
+    for item in data_root.get("items", []):
+        if item.get("id") is None:
+            continue
+        match_id = str(item.get("id"))
+        home = competitors_map.get(str(item.get("competitor1Id")), {}).get("name")
+        away = competitors_map.get(str(item.get("competitor2Id")), {}).get("name")
+        over_2_5_val = legacy_odds(decode_ladder(odds_map.get(match_id)))["over_2_5_odds"]
+        if not home or not away or over_2_5_val is None:
+            continue
+
+        # "2026-01-02 20:00:00" -> date + HH:MM like the page shows
+        start = str(item.get("time") or item.get("startTime") or "")
+        event_date, _, event_time = start.partition(" ")
+        event_date = event_date or "Unknown"
+        event_time = event_time[:5] or "Unknown"
+
+        matches.append({
+            "id": match_id,
+            "league": "Prematch",
+            "home_team": home,
+            "away_team": away,
+            "teams": f"{home} vs {away}",
+            "url": prematch_event_url(item, leagues_map.get(str(item.get("leagueId") or item.get("league")), {}), home, away),
+            "event_date": event_date,
+            "event_time": event_time,
+            "start_time": f"{event_date} {event_time}",
+            "over_2_5_odds": str(over_2_5_val),
+            "competitors": {
+                "home": {"name": home, "logo": "/logoreal.png"},
+                "away": {"name": away, "logo": "/logoreal.png"}
+            }
+        })
+    return matches
+
+
+def scrape_tonybet_prematch():
+    """
+    Prematch slate straight from the paginated event/list API (all pages,
+    fetched concurrently). Falls back to the DOM scroll path if the API fails
+    or TONYBET_FETCH_MODE=browser.
+    """
+    if FETCH_MODE == "http":
+        try:
+            start = time.time()
+            json_data = tonybet_api.event_list_pages(PREMATCH_API_HOST, PREMATCH_PARAMS, site_url=PREMATCH_SITE_URL)
+            matches = parse_prematch_response(json_data)
+            print(f"[Prematch] {len(matches)} matches with Over 2.5 from the API in {time.time() - start:.2f}s")
+            if matches:
+                return matches
+            print("[Prematch] API returned no matches, falling back to the DOM path...")
+        except Exception as e:
+            print(f"[Prematch] API fetch failed ({e}), falling back to the DOM path...")
+
+    return scrape_tonybet_prematch_dom()
+
+
 if __name__ == "__main__":
     data = scrape_tonybet_prematch()
     print(f"Total Scraped: {len(data)}")
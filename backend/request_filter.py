@@ -0,0 +1,139 @@
+import os
+import threading
+from urllib.parse import urlparse
+
+# Global off switch (e.g. when debugging a page that renders oddly without images)
+BLOCKING_ENABLED = os.getenv("RESOURCE_BLOCKING", "1") != "0"
+
+# Analytics / ads / chat widgets: never needed for the DOM or the JSON we read
+BLOCKED_HOSTS = (
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net", "googlesyndication.com",
+    "googleadservices.com", "facebook.net", "connect.facebook.com", "hotjar.com", "clarity.ms",
+    "mc.yandex.ru", "yandex.ru/metrika", "criteo.com", "criteo.net", "taboola.com", "outbrain.com",
+    "onesignal.com", "intercom.io", "livechatinc.com", "zdassets.com", "zendesk.com",
+    "scorecardresearch.com", "adnxs.com", "amazon-adsystem.com", "tiktok.com", "snapchat.com",
+    "cookielaw.org", "onetrust.com", "bat.bing.com", "sentry.io", "newrelic.com", "nr-data.net",
+)
+
+# Rough average sizes, only used to estimate what aborted requests would have cost
+TYPICAL_BYTES = {
+    "image": 30 * 1024,
+    "font": 45 * 1024,
+    "media": 500 * 1024,
+    "stylesheet": 30 * 1024,
+    "script": 60 * 1024,
+    "other": 10 * 1024,
+}
+
+DEFAULT_BLOCK_TYPES = ("image", "font", "media")
+
+# Per scraper: resource types to abort. Stylesheets stay on for pages we
+# scroll (lazy lists rely on layout / IntersectionObserver).
+POLICIES = {
+    "fast": DEFAULT_BLOCK_TYPES,
+    "live": DEFAULT_BLOCK_TYPES,
+    "prematch": DEFAULT_BLOCK_TYPES,
+    "oriol": ("image", "font", "media", "stylesheet"),
+    "cookies": ("image", "font", "media", "stylesheet"),
+    "365scores": ("image", "font", "media", "stylesheet"),
+    "flashscore": DEFAULT_BLOCK_TYPES,
+    "sofascore": ("image", "font", "media", "stylesheet"),
+}
+
+
+def policy_types(name):
+    """Blocked types for a scraper; RESOURCE_BLOCK_<NAME>=image,font overrides the default."""
+    override = os.getenv(f"RESOURCE_BLOCK_{name.upper()}")
+    if override is not None:
+        return tuple(t.strip() for t in override.split(",") if t.strip())
+    return POLICIES.get(name, DEFAULT_BLOCK_TYPES)
+
+
+# Totals across every cycle, shown by /api/browser-pool
+totals = {"blocked": 0, "estimated_bytes_saved": 0, "transferred_bytes": 0}
+totals_lock = threading.Lock()
+
+
+class RequestFilter:
+    """
+    page.route based filter shared by all Playwright scrapers. Aborts the
+    policy's resource types and known tracker hosts; everything else goes
+    through untouched. Counts blocked requests and allowed response bytes
+    for the per-cycle report.
+    """
+
+    def __init__(self, name, block_types=None, blocked_hosts=BLOCKED_HOSTS):
+        self.name = name
+        self.block_types = set(policy_types(name) if block_types is None else block_types)
+        self.blocked_hosts = blocked_hosts
+        self.blocked = {}  # resource type / "tracker" -> count
+        self.estimated_saved = 0
+        self.transferred = 0
+
+    def _is_tracker(self, url):
+        parsed = urlparse(url)
+        target = parsed.netloc + parsed.path
+        return any(host in target for host in self.blocked_hosts)
+
+    def _reason(self, request):
+        """Why this request is blocked (resource type / "tracker"), None to let it through."""
+        resource_type = request.resource_type
+        if resource_type in self.block_types:
+            return resource_type
+        if resource_type != "document" and self._is_tracker(request.url):
+            return "tracker"
+        return None
+
+    def _count(self, request, reason):
+        self.blocked[reason] = self.blocked.get(reason, 0) + 1
+        self.estimated_saved += TYPICAL_BYTES.get(request.resource_type, TYPICAL_BYTES["other"])
+
+    def _handle(self, route):
+        reason = self._reason(route.request)
+        if reason is None:
+            route.continue_()
+            return
+        self._count(route.request, reason)
+        route.abort()
+
+    async def _handle_async(self, route):
+        reason = self._reason(route.request)
+        if reason is None:
+            await route.continue_()
+            return
+        self._count(route.request, reason)
+        await route.abort()
+
+    def _on_response(self, response):
+        # Header only: no body read, so this stays cheap
+        try:
+            self.transferred += int(response.headers.get("content-length") or 0)
+        except ValueError:
+            pass
+
+    def install(self, target):
+        """Installs on a BrowserContext (covers every page) or a single Page."""
+        if not BLOCKING_ENABLED:
+            return self
+        target.route("**/*", self._handle)
+        target.on("response", self._on_response)
+        return self
+
+    async def install_async(self, target):
+        """Same as install() for the async Playwright API."""
+        if not BLOCKING_ENABLED:
+            return self
+        await target.route("**/*", self._handle_async)
+        target.on("response", self._on_response)
+        return self
+
+    def report(self):
+        """Adds this cycle to the global totals and returns the log line."""
+        blocked = sum(self.blocked.values())
+        with totals_lock:
+            totals["blocked"] += blocked
+            totals["estimated_bytes_saved"] += self.estimated_saved
+            totals["transferred_bytes"] += self.transferred
+        detail = ", ".join(f"{k} {v}" for k, v in sorted(self.blocked.items())) or "nothing"
+        return (f"[RequestFilter:{self.name}] blocked {blocked} requests ({detail}), "
+                f"~{self.estimated_saved / 1024 / 1024:.1f} MB saved (estimate from typical sizes), {self.transferred / 1024 / 1024:.1f} MB transferred")
@@ -0,0 +1,238 @@
+import os
+import random
+import threading
+import time
+
+# At most this many jobs run at once (each heavy job drives its own Chromium)
+MAX_CONCURRENT = int(os.getenv("SCHEDULER_MAX_CONCURRENT", "2"))
+# Don't start another job while Chromium uses more than this (needs psutil; 0 = off)
+MAX_RSS_MB = int(os.getenv("SCHEDULER_MAX_RSS_MB", "2500"))
+# While over that budget, re-check memory this often (finishing jobs wake us sooner)
+MEMORY_RETRY_SECONDS = 30
+
+
+class Job:
+    """
+    One scheduled scraper job. Runs on its own long-lived thread so the
+    thread-bound browser from browser_pool stays warm between runs.
+    """
+
+    def __init__(self, name, func, interval, priority=10, jitter=0.1, fixed_rate=True,
+                 interval_fn=None, min_interval=None, max_interval=None):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.priority = priority  # Lower runs first when several jobs are due
+        self.jitter = jitter  # +/- fraction of the interval
+        self.fixed_rate = fixed_rate  # True: every `interval` from the planned start; False: `interval` after finishing
+        self.interval_fn = interval_fn  # Optional adaptive interval: fn(job) -> seconds
+        self.min_interval = min_interval if min_interval is not None else interval / 4
+        self.max_interval = max_interval if max_interval is not None else interval * 4
+
+        self.next_run = time.time()
+        self.planned_at = self.next_run
+        self.running = False
+        self.runs = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.skipped = 0
+        self.last_started = None
+        self.last_duration = None
+        self.last_error = None
+        self.current_interval = interval
+
+        self._go = threading.Event()
+        self._thread = None
+
+    def next_interval(self):
+        interval = self.interval
+        if self.interval_fn is not None:
+            try:
+                interval = self.interval_fn(self)
+            except Exception as e:
+                print(f"[Scheduler] Adaptive interval for {self.name} failed: {e}")
+                interval = self.interval
+            interval = min(max(interval, self.min_interval), self.max_interval)
+        # Back off while a job keeps failing (2x per failure, capped at max_interval)
+        if self.consecutive_failures:
+            interval = min(interval * (2 ** min(self.consecutive_failures, 4)), self.max_interval)
+        self.current_interval = interval
+        return interval
+
+    def info(self):
+        now = time.time()
+        return {
+            "name": self.name,
+            "priority": self.priority,
+            "running": self.running,
+            "interval": round(self.current_interval, 1),
+            "next_run_in": round(max(0, self.next_run - now), 1),
+            "last_started": self.last_started,
+            "last_duration": round(self.last_duration, 2) if self.last_duration is not None else None,
+            "runs": self.runs,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "skipped": self.skipped,
+            "last_error": self.last_error,
+        }
+
+
+class Scheduler:
+    """
+    Single dispatcher for all background scrapers (replaces the per-scraper
+    while/sleep loops). Fixed-rate or adaptive intervals with jitter,
+    priorities, skip-if-running, and global concurrency / Chromium memory
+    budgets. info() feeds /api/scheduler.
+    """
+
+    def __init__(self, max_concurrent=MAX_CONCURRENT, max_rss_mb=MAX_RSS_MB, rss_fn=None):
+        self.max_concurrent = max_concurrent
+        self.max_rss_mb = max_rss_mb
+        self.rss_fn = rss_fn
+        self.jobs = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self.deferred_for_memory = 0  # Due runs held back by the memory budget (once per run)
+        self._memory_deferred = set()  # Names of jobs currently held back
+
+    def add(self, name, func, interval, **options):
+        job = Job(name, func, interval, **options)
+        with self._lock:
+            self.jobs[name] = job
+        self._wake.set()
+        return job
+
+    def start(self):
+        if self._thread is not None:
+            return
+        for job in self.jobs.values():
+            self._start_worker(job)
+        self._thread = threading.Thread(target=self._dispatch_loop, name="scheduler", daemon=True)
+        self._thread.start()
+        print(f"[Scheduler] Started with {len(self.jobs)} jobs (max {self.max_concurrent} concurrent)")
+
+    def run_now(self, name):
+        """Moves a job's next run to now (e.g. when its inputs changed)."""
+        with self._lock:
+            job = self.jobs.get(name)
+            if job and not job.running:
+                job.next_run = job.planned_at = time.time()
+        self._wake.set()
+
+    # --- workers ---------------------------------------------------------------
+
+    def _start_worker(self, job):
+        if job._thread is None:
+            job._thread = threading.Thread(target=self._worker_loop, args=(job,), name=f"job-{job.name}", daemon=True)
+            job._thread.start()
+
+    def _worker_loop(self, job):
+        while True:
+            job._go.wait()
+            job._go.clear()
+            start = time.time()
+            error = None
+            try:
+                job.func()
+            except Exception as e:
+                error = f"{e.__class__.__name__}: {e}"
+                print(f"[Scheduler] Job {job.name} failed: {error}")
+            self._finished(job, start, error)
+
+    def _finished(self, job, start, error):
+        now = time.time()
+        with self._lock:
+            job.running = False
+            job.runs += 1
+            job.last_duration = now - start
+            if error:
+                job.failures += 1
+                job.consecutive_failures += 1
+                job.last_error = error
+            else:
+                job.consecutive_failures = 0
+
+            interval = job.next_interval()
+            base = job.planned_at if job.fixed_rate else now
+            planned = base + interval
+            if planned < now:
+                # Overran its slot(s): move to the next slot on the grid, no catch-up burst
+                planned += ((now - planned) // interval + 1) * interval
+            job.planned_at = planned
+            job.next_run = planned + random.uniform(-job.jitter, job.jitter) * interval
+        print(f"[Scheduler] {job.name} finished in {job.last_duration:.1f}s, next in {max(0, job.next_run - now):.0f}s")
+        self._wake.set()
+
+    # --- dispatcher ------------------------------------------------------------
+
+    def _over_memory_budget(self):
+        if not self.max_rss_mb or self.rss_fn is None:
+            return False
+        rss = self.rss_fn()
+        return rss is not None and rss > self.max_rss_mb
+
+    def _dispatch_loop(self):
+        while True:
+            now = time.time()
+            with self._lock:
+                running = sum(1 for j in self.jobs.values() if j.running)
+                due = sorted(
+                    (j for j in self.jobs.values() if j.next_run <= now),
+                    key=lambda j: (j.priority, j.next_run)
+                )
+                to_start = []
+                for job in due:
+                    if job.running:
+                        # Skip-if-running: never overlap a job with itself
+                        job.skipped += 1
+                        job.next_run = now + job.current_interval
+                        continue
+                    if running + len(to_start) >= self.max_concurrent:
+                        break  # Lower-priority jobs stay due until a slot frees up
+                    to_start.append(job)
+
+            memory_blocked = False
+            for job in to_start:
+                # Memory budget: only start something new if Chromium is under the cap
+                # (a job is always allowed to start when nothing else is running)
+                if (running or job is not to_start[0]) and self._over_memory_budget():
+                    memory_blocked = True
+                    for waiting in to_start[to_start.index(job):]:
+                        if waiting.name not in self._memory_deferred:
+                            self._memory_deferred.add(waiting.name)
+                            self.deferred_for_memory += 1
+                    break
+                self._memory_deferred.discard(job.name)
+                with self._lock:
+                    job.running = True
+                    job.last_started = time.time()
+                    # If it is still running at its next slot, that slot is skipped
+                    job.next_run = max(job.planned_at, now) + job.current_interval
+                job._go.set()
+                running += 1
+
+            # Sleep until the next job becomes due. Jobs that are due but blocked by the
+            # concurrency limit don't count: a finishing job sets _wake. Memory-blocked
+            # ones are re-checked every MEMORY_RETRY_SECONDS instead of spinning.
+            now = time.time()
+            with self._lock:
+                upcoming = [j.next_run for j in self.jobs.values() if not j.running and j.next_run > now]
+            timeout = min(upcoming) - now if upcoming else 60
+            if memory_blocked:
+                timeout = min(timeout, MEMORY_RETRY_SECONDS)
+            self._wake.wait(timeout=min(max(timeout, 0.05), 60))
+            self._wake.clear()
+
+    def info(self):
+        with self._lock:
+            jobs = sorted((j.info() for j in self.jobs.values()), key=lambda j: j["priority"])
+            running = sum(1 for j in self.jobs.values() if j.running)
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_rss_mb": self.max_rss_mb,
+            "chromium_rss_mb": self.rss_fn() if self.rss_fn else None,
+            "running": running,
+            "deferred_for_memory": self.deferred_for_memory,
+            "jobs": jobs,
+        }
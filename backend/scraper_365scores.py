@@ -1,26 +1,314 @@
-from playwright.sync_api import sync_playwright
-import json
+from browser_pool import browser_pool
+from stats_store import stats_store
+import asyncio
+import httpx
+from concurrent.futures import ThreadPoolExecutor
+import os
+import random
 import time
 from datetime import datetime
 
-OUTPUT_FILE = "365scores_live.json"
+API_STATS_BASE = "https://webws.365scores.com/web/game/stats/?appTypeId=5&langId=14&timezoneName=Europe/Madrid&userCountryId=2"
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+# Stats fetching limits (cycle time scales with these, not with the game count)
+STATS_CONCURRENCY = int(os.getenv("STATS_365_CONCURRENCY", "8"))
+STATS_RATE_PER_SEC = float(os.getenv("STATS_365_RATE", "10"))
+STATS_TIMEOUT = 10
+STATS_RETRIES = 3
+STATS_BACKOFF = 0.5
+# Game ids per stats request (games=1,2,3); shrinks when 365Scores rejects a batch
+STATS_BATCH_MAX = int(os.getenv("STATS_365_BATCH", "20"))
+# Games whose clock/score/status didn't move keep their cached stats up to this long
+STATS_TTL = int(os.getenv("STATS_365_TTL", "300"))
+
+# The async stats fetch runs on its own thread: the job thread already drives the
+# sync Playwright API (browser_pool), whose event loop blocks asyncio.run there
+stats_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="365-stats")
+
+
+class TokenBucket:
+    """Async token bucket: at most `rate` requests/s with bursts up to `capacity`."""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1, int(rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AdaptiveBatch:
+    """
+    Batch size for multi-game stats requests. Halves on a rejected/truncated
+    batch, grows back one game at a time after clean batches. Kept across cycles.
+    """
+
+    def __init__(self, max_size=STATS_BATCH_MAX, min_size=1):
+        self.max_size = max_size
+        self.min_size = min_size
+        self.size = max_size
+
+    def shrink(self, failed_size):
+        new_size = max(self.min_size, failed_size // 2)
+        if new_size < self.size:
+            print(f"    [365 Batch] Shrinking stats batch {self.size} -> {new_size}")
+            self.size = new_size
+
+    def grow(self, ok_size):
+        # Only a clean batch at the current size earns a bigger one
+        if ok_size >= self.size and self.size < self.max_size:
+            self.size += 1
+
+
+stats_batch = AdaptiveBatch()
+
+
+# game id -> {"fingerprint", "fetched_at", "stats"} from previous cycles
+stats_cache = {}
+
+
+def game_fingerprint(g):
+    """What has to change in the allscores entry before the game's stats are worth re-fetching."""
+    home_comp = g.get('homeCompetitor', {})
+    away_comp = g.get('awayCompetitor', {})
+    return (
+        g.get('statusId'),
+        g.get('statusText'),
+        g.get('gameTime'),
+        g.get('gameTimeDisplay'),
+        home_comp.get('score'),
+        away_comp.get('score'),
+    )
+
+
+def split_stale_games(games, now=None):
+    """Returns (stale, fresh): games to re-fetch and games served from stats_cache."""
+    now = now or time.time()
+    stale = []
+    fresh = []
+    for g in games:
+        cached = stats_cache.get(g.get('id'))
+        if (cached and cached["fingerprint"] == game_fingerprint(g)
+                and now - cached["fetched_at"] < STATS_TTL):
+            fresh.append(g)
+        else:
+            stale.append(g)
+    return stale, fresh
+
+
+def map_stat_key(name):
+    name_lower = name.lower()
+    # Map metrics (Fuzzy match / Hybrid English-Spanish)
+    if "total remates" in name_lower or "total shots" in name_lower or "remates" == name_lower: return "total_shots"
+    elif "puerta" in name_lower or "on goal" in name_lower or "on target" in name_lower: return "shots_on_goal"
+    elif "fuera" in name_lower or "off goal" in name_lower or "off target" in name_lower: return "shots_off_goal"
+    elif "bloqueados" in name_lower or "blocked" in name_lower: return "blocked_shots"
+    elif "pases" in name_lower or "passes" in name_lower: return "passes_completed"
+    elif "amarillas" in name_lower or "yellow" in name_lower: return "yellow_cards"
+    elif "rojas" in name_lower or "red" in name_lower: return "red_cards"
+    elif "posesión" in name_lower or "possession" in name_lower: return "possession"
+    elif "esquina" in name_lower or "corner" in name_lower: return "corners"
+    return None
+
+
+def parse_statistics(statistics, home_id, away_id):
+    """Maps a 365Scores `statistics` array into {"home": {...}, "away": {...}}."""
+    stats = {"home": {}, "away": {}}
+    for item in statistics:
+        name = item.get("name")
+        val = item.get("value")
+        comp_id = item.get("competitorId")
+
+        # Determine side
+        side = None
+        if str(comp_id) == str(home_id): side = "home"
+        elif str(comp_id) == str(away_id): side = "away"
+
+        if side and name:
+            key = map_stat_key(name)
+            if key:
+                stats[side][key] = val
+    return stats
+
+
+async def fetch_json_with_retry(client, url, limiter, semaphore):
+    """GET with rate limiting, a per-request timeout and exponential backoff on failures."""
+    for attempt in range(STATS_RETRIES):
+        async with semaphore:
+            await limiter.acquire()
+            try:
+                res = await client.get(url, timeout=STATS_TIMEOUT)
+                if res.status_code == 200:
+                    return res.json()
+                # 4xx (except 429) won't get better by retrying
+                if res.status_code < 500 and res.status_code != 429:
+                    print(f"    Stats fetch failed: {res.status_code}")
+                    return None
+                error = f"status {res.status_code}"
+            except (httpx.HTTPError, ValueError) as e:
+                error = repr(e)
+        # Back off outside the semaphore so other games keep flowing
+        await asyncio.sleep(STATS_BACKOFF * (2 ** attempt) + random.uniform(0, STATS_BACKOFF))
+    print(f"    Stats fetch gave up after {STATS_RETRIES} attempts: {error}")
+    return None
+
+
+def empty_match_data(g):
+    home_comp = g.get('homeCompetitor', {})
+    away_comp = g.get('awayCompetitor', {})
+    return {
+        "id": g.get('id'),
+        "homeTeam": home_comp.get('name', 'Unknown Home'),
+        "awayTeam": away_comp.get('name', 'Unknown Away'),
+        "stats": {"home": {}, "away": {}}
+    }
+
+
+def demux_statistics(statistics, games):
+    """
+    Splits the `statistics` array of a multi-game response back per game.
+    Uses the item's gameId when present, otherwise the competitorId
+    (a competitor only plays one live game at a time).
+    Returns {game_id: [items]}.
+    """
+    game_ids = {str(g.get('id')): g.get('id') for g in games}
+    competitor_game = {}
+    for g in games:
+        for side in ('homeCompetitor', 'awayCompetitor'):
+            comp_id = g.get(side, {}).get('id')
+            if comp_id is not None:
+                competitor_game[str(comp_id)] = g.get('id')
+
+    per_game = {g.get('id'): [] for g in games}
+    for item in statistics:
+        gid = game_ids.get(str(item.get("gameId"))) if item.get("gameId") is not None else None
+        if gid is None:
+            gid = competitor_game.get(str(item.get("competitorId")))
+        if gid is not None:
+            per_game[gid].append(item)
+    return per_game
+
+
+async def fetch_stats_batch(client, games, limiter, semaphore, allow_empty_split=True):
+    """
+    Fetches stats for several games in one request (games=1,2,3).
+    Rejected batches (4xx, 429/5xx, malformed) are split in half and retried,
+    and shrink the shared batch size. A batch where no game came back with stats
+    is split once more in case the server truncated it; it only shrinks the
+    batch size if the halves do return stats (all-empty is normal for games
+    without stats yet). Returns {game_id: stats or None} for every game that
+    got an answer; games whose fetch failed are left out.
+    """
+    ids = ",".join(str(g.get('id')) for g in games)
+    data = await fetch_json_with_retry(client, f"{API_STATS_BASE}&games={ids}", limiter, semaphore)
+
+    rejected = not data or not isinstance(data.get("statistics"), list)
+    per_game = {}
+    if not rejected:
+        by_game = demux_statistics(data["statistics"], games)
+        for g in games:
+            items = by_game.get(g.get('id'), [])
+            per_game[g.get('id')] = parse_statistics(items, g.get('homeCompetitor', {}).get('id'), g.get('awayCompetitor', {}).get('id')) if items else None
+
+    if len(games) > 1 and (rejected or (not any(per_game.values()) and allow_empty_split)):
+        if rejected:
+            stats_batch.shrink(len(games))
+        half = len(games) // 2
+        parts = await asyncio.gather(
+            fetch_stats_batch(client, games[:half], limiter, semaphore, allow_empty_split=rejected),
+            fetch_stats_batch(client, games[half:], limiter, semaphore, allow_empty_split=rejected),
+        )
+        merged = {**parts[0], **parts[1]}
+        if not rejected and any(merged.values()):
+            # Empty as a whole but not in halves: the server truncated the batch
+            stats_batch.shrink(len(games))
+        return merged
+
+    if not rejected and len(games) > 1:
+        stats_batch.grow(len(games))
+    return per_game
+
+
+async def fetch_all_stats(live_matches, cookies):
+    """
+    Fetches stats for the live games that changed, in batches with bounded
+    concurrency; unchanged games reuse their cached stats. Keeps list order.
+    """
+    limiter = TokenBucket(STATS_RATE_PER_SEC)
+    semaphore = asyncio.Semaphore(STATS_CONCURRENCY)
+    jar = httpx.Cookies()
+    for c in cookies:
+        jar.set(c["name"], c["value"], domain=c.get("domain", ""), path=c.get("path", "/"))
+
+    games = [g for g in live_matches if g.get('id')]
+    # Only games whose clock/score/status moved (or whose stats expired) hit the network
+    stale, fresh = split_stale_games(games)
+    size = stats_batch.size
+    batches = [stale[i:i + size] for i in range(0, len(stale), size)]
+
+    limits = httpx.Limits(max_connections=STATS_CONCURRENCY, max_keepalive_connections=STATS_CONCURRENCY)
+    async with httpx.AsyncClient(headers={"User-Agent": USER_AGENT}, cookies=jar, limits=limits) as client:
+        parts = await asyncio.gather(*[fetch_stats_batch(client, b, limiter, semaphore) for b in batches])
+
+    stats_by_game = {}
+    for part in parts:
+        stats_by_game.update(part)
+
+    now = time.time()
+    failed = 0
+    for g in stale:
+        if g.get('id') not in stats_by_game:
+            # Fetch failed: keep the previous entry (and its fetched_at) so the game is retried next cycle
+            failed += 1
+            continue
+        # Games answered without stats are cached too, so quiet lower leagues aren't re-asked every cycle
+        stats_cache[g.get('id')] = {
+            "fingerprint": game_fingerprint(g),
+            "fetched_at": now,
+            "stats": stats_by_game[g.get('id')],
+        }
+    # Forget games that are no longer live
+    live_ids = {g.get('id') for g in games}
+    for gid in list(stats_cache):
+        if gid not in live_ids:
+            del stats_cache[gid]
+
+    results = []
+    for g in games:
+        match_data = empty_match_data(g)
+        cached_stats = (stats_cache.get(g.get('id')) or {}).get("stats")
+        if cached_stats:
+            match_data["stats"] = cached_stats
+        results.append(match_data)
+    print(f"Stats: {len(stale)} games re-fetched in {len(batches)} initial batches of up to {size} "
+          f"({failed} failed, kept previous), {len(fresh)} unchanged games served from cache")
+    return results
+
 
 def scrape_365scores():
     print("Starting 365Scores Scraper (Direct API)...")
     results = []
-    
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
+
+    with browser_pool.lease("365scores", block="365scores") as context:
         # 365Scores needs consistent context
-        context = browser.new_context(
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        )
         page = context.new_page()
-        
+
         # 1. Fetch Live Map List via API
         # Construct URL with today's date
         today = datetime.now().strftime("%d/%m/%Y")
-        
+
         # API discovered via sniffer
         api_live_list = (
             f"https://webws.365scores.com/web/games/allscores/?"
@@ -28,10 +316,11 @@ def scrape_365scores():
             f"&startDate={today}&endDate={today}"
             f"&showOdds=true&onlyLiveGames=true&withTop=true"
         )
-        
+
         print(f"Fetching Live List from: {api_live_list}")
-        
+
         live_matches = []
+        list_error = None
         try:
             res = page.request.get(api_live_list)
             if res.status == 200:
@@ -40,93 +329,33 @@ def scrape_365scores():
                     print(f"Found {len(data['games'])} live games.")
                     live_matches = data["games"]
                 else:
-                    print("No 'games' key in response.")
+                    list_error = "no 'games' key in response"
             else:
-                print(f"Failed to fetch live list: Status {res.status}")
+                list_error = f"status {res.status}"
         except Exception as e:
-            print(f"Error fetching live list: {e}")
-            
-        print(f"Processing {len(live_matches)} matches...")
-        
-        # 2. Fetch Stats for Each Match
-        api_stats_base = "https://webws.365scores.com/web/game/stats/?appTypeId=5&langId=14&timezoneName=Europe/Madrid&userCountryId=2"
-        
-        for g in live_matches:
-            mid = g.get('id')
-            if not mid: continue
-            
-            home_comp = g.get('homeCompetitor', {})
-            away_comp = g.get('awayCompetitor', {})
-            
-            home_name = home_comp.get('name', 'Unknown Home')
-            away_name = away_comp.get('name', 'Unknown Away')
-            home_id = home_comp.get('id')
-            away_id = away_comp.get('id')
-            
-            print(f"  Fetching stats for {home_name} vs {away_name} ({mid})...")
-            
-            match_data = {
-                "id": mid,
-                "homeTeam": home_name,
-                "awayTeam": away_name,
-                "stats": {"home": {}, "away": {}}
-            }
-            
-            try:
-                stats_url = f"{api_stats_base}&games={mid}"
-                res_stats = page.request.get(stats_url)
-                
-                if res_stats.status == 200:
-                    data = res_stats.json()
-                    
-                    if "statistics" in data:
-                        for item in data["statistics"]:
-                            name = item.get("name")
-                            val = item.get("value")
-                            comp_id = item.get("competitorId")
-                            
-                            # Determine side
-                            side = None
-                            if str(comp_id) == str(home_id): side = "home"
-                            elif str(comp_id) == str(away_id): side = "away"
-                            
-                            if side:
-                                key = None
-                                # Map metrics
-                                name_lower = name.lower()
-                                
-                                key = None
-                                # Map metrics (Fuzzy match / Hybrid English-Spanish)
-                                if "total remates" in name_lower or "total shots" in name_lower or "remates" == name_lower: key = "total_shots"
-                                elif "puerta" in name_lower or "on goal" in name_lower or "on target" in name_lower: key = "shots_on_goal"
-                                elif "fuera" in name_lower or "off goal" in name_lower or "off target" in name_lower: key = "shots_off_goal"
-                                elif "bloqueados" in name_lower or "blocked" in name_lower: key = "blocked_shots"
-                                elif "pases" in name_lower or "passes" in name_lower: key = "passes_completed"
-                                elif "amarillas" in name_lower or "yellow" in name_lower: key = "yellow_cards"
-                                elif "rojas" in name_lower or "red" in name_lower: key = "red_cards"
-                                elif "posesión" in name_lower or "possession" in name_lower: key = "possession"
-                                elif "esquina" in name_lower or "corner" in name_lower: key = "corners"
-                                
-                                if key:
-                                    match_data["stats"][side][key] = val
-                    else:
-                        pass 
-                        # print(f"    No stats details available.")
-                else:
-                    print(f"    Stats fetch failed: {res_stats.status}")
-                    
-            except Exception as e:
-                print(f"    Error finding stats: {e}")
-                
-            results.append(match_data)
-            time.sleep(0.1) # Brief pause
-            
-        browser.close()
-        
-    # Save
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        json.dump(results, f, indent=2, ensure_ascii=False)
-    print(f"Saved {len(results)} matches to {OUTPUT_FILE}")
+            list_error = repr(e)
+
+        # Session cookies for the plain HTTP stats requests
+        cookies = context.cookies()
+        page.close()
+
+    if list_error is not None:
+        # No list != no live games: keep stats_cache and the published stats as they are
+        # (an empty publish would strip stats_365 from every fast match)
+        raise RuntimeError(f"365Scores live list unavailable ({list_error}), keeping previous stats")
+
+    print(f"Processing {len(live_matches)} matches...")
+
+    # 2. Fetch Stats for all matches concurrently (bounded + rate limited)
+    start_time = time.time()
+    results = stats_executor.submit(asyncio.run, fetch_all_stats(live_matches, cookies)).result()
+    print(f"Fetched stats for {len(results)} matches in {time.time() - start_time:.2f}s "
+          f"(concurrency={STATS_CONCURRENCY}, rate={STATS_RATE_PER_SEC}/s)")
+
+    # Publish in memory for the fast-odds merge (also persisted for warm restarts)
+    snapshot = stats_store.publish(results)
+    print(f"Published {len(results)} matches as stats version {snapshot.version}")
+    return results
 
 if __name__ == "__main__":
     scrape_365scores()
@@ -1,31 +1,273 @@
 import re
-from playwright.sync_api import sync_playwright
+from browser_pool import browser_pool
+from logo_resolver import get_logo_url
+from tonybet_api import tonybet_api, FETCH_MODE
+from scroll_driver import ScrollDriver
+from odds_ladder import decode_ladders, legacy_odds
 from bs4 import BeautifulSoup
 import time
 import datetime
 import os
 import json
 
-def get_logo_url(team_name):
+# "js" = single page.evaluate returning compact rows, "bs4" = old page.content() + BeautifulSoup
+PARSE_MODE = os.getenv("FAST_PARSE_MODE", "js").lower().strip()
+# When set, each cycle also saves the rendered page here (input for bench_fast_parse.py)
+SNAPSHOT_DIR = os.getenv("FAST_SNAPSHOT_DIR")
+
+# Walks teamSeoTitles once in the page and returns only what build_fast_match needs.
+# text() mimics BeautifulSoup get_text(strip=True) so both modes give identical rows.
+EXTRACT_ROWS_JS = """() => {
+    const text = (el, sep) => {
+        if (!el) return null;
+        const parts = [];
+        const walker = document.createTreeWalker(el, NodeFilter.SHOW_TEXT);
+        while (walker.nextNode()) {
+            const t = walker.currentNode.nodeValue.trim();
+            if (t) parts.push(t);
+        }
+        return parts.join(sep || "");
+    };
+
+    // Headers and rows in document order -> the header in force for each row
+    const headerOf = new Map();
+    let header = null;
+    for (const el of document.querySelectorAll('div[data-test="eventTableHeader"], div[data-test="eventTableRow"]')) {
+        if (el.getAttribute('data-test') === 'eventTableHeader') header = el;
+        else headerOf.set(el, header);
+    }
+
+    const rows = [];
+    for (const titles of document.querySelectorAll('div[data-test="teamSeoTitles"]')) {
+        const row = titles.parentElement ? titles.parentElement.closest('div[data-test="eventTableRow"]') : null;
+        if (!row) continue;
+        const link = row.querySelector('a[data-test="eventLink"]');
+        if (!link) continue;
+
+        const timer = row.querySelector('div[data-test="liveTimer"]');
+        const hdr = headerOf.get(row) || null;
+        let leagueName = null, leagueFlag = null;
+        if (hdr) {
+            const leagueLink = hdr.querySelector('a[data-test="leagueLink"]');
+            leagueName = leagueLink ? text(leagueLink) : null;
+            const imgs = hdr.querySelectorAll('img');
+            leagueFlag = imgs.length ? (imgs[imgs.length - 1].getAttribute('src') || "") : null;
+        }
+
+        rows.push({
+            href: link.getAttribute('href'),
+            teams: [...titles.querySelectorAll('div[data-test="teamName"]')].map(el => text(el)),
+            scores: [...titles.querySelectorAll('div[data-test="teamScore"]')].map(el => text(el)),
+            timer: timer ? text(timer) : null,
+            // Only needed for the half-time / full-time fallback
+            row_text: timer ? null : text(row, " "),
+            league_name: leagueName,
+            league_flag: leagueFlag
+        });
+    }
+    return rows;
+}"""
+
+
+def extract_rows_bs(content):
     """
-    Returns the URL for the team's logo if it exists locally.
-    Otherwise returns the default logo.
+    Legacy extraction: builds the full BeautifulSoup tree and returns the
+    same compact rows as EXTRACT_ROWS_JS.
     """
-    if not team_name:
-        return "/logoreal.png"
+    soup = BeautifulSoup(content, 'html.parser')
+    rows = []
+
+    for team_titles_container in soup.find_all('div', attrs={'data-test': 'teamSeoTitles'}):
+        event_table_row = team_titles_container.find_parent('div', attrs={'data-test': 'eventTableRow'})
+        if not event_table_row: continue
+
+        link_el = event_table_row.find('a', attrs={'data-test': 'eventLink'})
+        if not link_el: continue
+
+        timer_el = event_table_row.find('div', attrs={'data-test': 'liveTimer'})
+        header_el = event_table_row.find_previous('div', attrs={'data-test': 'eventTableHeader'})
+
+        league_name = None
+        league_flag = None
+        if header_el:
+            league_link = header_el.find('a', attrs={'data-test': 'leagueLink'})
+            if league_link: league_name = league_link.get_text(strip=True)
+            images = header_el.find_all('img')
+            if images: league_flag = images[-1].get('src') or ""
+
+        rows.append({
+            "href": link_el.get('href'),
+            "teams": [d.get_text(strip=True) for d in team_titles_container.find_all('div', attrs={'data-test': 'teamName'})],
+            "scores": [d.get_text(strip=True) for d in team_titles_container.find_all('div', attrs={'data-test': 'teamScore'})],
+            "timer": timer_el.get_text(strip=True) if timer_el else None,
+            "row_text": None if timer_el else event_table_row.get_text(separator=" ", strip=True),
+            "league_name": league_name,
+            "league_flag": league_flag,
+        })
+
+    return rows
+
+
+def build_fast_match(row, base_origin, ladders):
+    """Turns one extracted row into the /api/fast-odds match dict (None to skip it)."""
+    href = row.get('href')
+    if not href: return None
+    if 'football' not in href and 'soccer' not in href: return None
+    if 'american-football' in href: return None # Explicitly exclude NFL/American Football
+    
+    # Extract Match ID from HREF for JSON lookup
+    # URL samples: /live/football/1008007-laliga/7802786-osasuna-alaves
+    parts = href.split('/')
+    # Sometimes structure varies. Grab the last part that starts with a number?
+    raw_id_part = parts[-1]
+    match_db_id = raw_id_part.split('-')[0]
+    
+    # Verify ID extraction
+    if not match_db_id.isdigit():
+         # Try finding it in other parts
+         match_id_match = re.search(r'/(\\d+)-', href)
+         if match_id_match:
+             match_db_id = match_id_match.group(1)
     
-    # Normalize name to match how download_logos.js saves them
-    safe_name = re.sub(r'[^a-zA-Z0-9]', '_', team_name).lower() + ".png"
+    # Dynamic base URL
+    full_url = f"{base_origin}{href}"
     
-    # Check if file exists in public/logos relative to this script
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    logos_dir = os.path.join(current_dir, '..', 'public', 'logos')
-    file_path = os.path.join(logos_dir, safe_name)
+    # --- HTML Extraction (Teams, Score, Time) ---
+    teams = row.get('teams') or []
+    if len(teams) < 2:
+        return None
+        
+    home_team = re.sub(r'\d+$', '', teams[0]).strip()
+    away_team = re.sub(r'\d+$', '', teams[1]).strip()
+
+    home_score = "0"; away_score = "0"
+    scores = row.get('scores') or []
+    if len(scores) >= 2:
+        home_score = scores[0]
+        away_score = scores[1]
+
+    current_minute = "Not started"
+    # Try multiple strategies to detect match time/status
+    # Strategy 1: liveTimer element
+    if row.get('timer') is not None:
+        current_minute = "".join(row['timer'].split())
     
-    if os.path.exists(file_path):
-        return f"/logos/{safe_name}"
+    # Strategy 2: If still "Not started" but we have scores, look for halftime/other status
+    if current_minute == "Not started" and (home_score != "0" or away_score != "0"):
+        # Search all text in the event row for common halftime indicators
+        row_text = (row.get('row_text') or "").lower()
+        
+        # Check for halftime indicators
+        if any(indicator in row_text for indicator in ["medio tiempo", "descanso", "half time", "ht", "halftime"]):
+            current_minute = "Half time"
+        # Check for full time
+        elif any(indicator in row_text for indicator in ["finalizado", "final", "ft", "full time"]):
+            current_minute = "End"
+        else:
+            # If we have scores but no time info, assume it's in play
+            current_minute = "In play"
     
-    return "/logoreal.png"
+    # League Header
+    league_header = {"name": "", "flag": ""}
+    if row.get('league_name'):
+        league_header["name"] = row['league_name']
+    raw_src = row.get('league_flag')
+    if raw_src is not None:
+        if raw_src.startswith('/'): league_header["flag"] = f"https://tonybet.es{raw_src}"
+        else: league_header["flag"] = raw_src
+
+    # --- ODDS EXTRACTION (Hybrid) ---
+    # Ladder decoded once per cycle from the intercepted JSON; legacy keys derived from it
+    ladder = ladders.get(match_db_id, [])
+    odds_dict = legacy_odds(ladder)
+
+    # Construct Final Object
+    match_data = {
+        "id": str(match_db_id),
+        "league": "Live", 
+        "home_team": home_team,
+        "away_team": away_team,
+        "teams": f"{home_team} vs {away_team}",
+        "url": full_url,
+        "start_time": datetime.datetime.now().isoformat(),
+        "current_minute": current_minute,
+        "home_score": home_score,
+        "away_score": away_score,
+        "tournament": {
+            "name": "Live Matches", "id": 0, "urn_id": "0"
+        },
+        "league_header": league_header,
+        "competitors": {
+            "home": {"name": home_team, "logo": get_logo_url(home_team), "urn_id": "0"},
+            "away": {"name": away_team, "logo": get_logo_url(away_team), "urn_id": "0"}
+        },
+        # Every total goals line offered: [[line, over, under], ...]
+        "goal_lines": [list(step) for step in ladder],
+        **odds_dict # Unpack odds
+    }
+
+    return match_data
+
+
+# Responses worth pulling a body for (everything else is skipped on URL/headers alone)
+ODDS_URL_PATTERN = re.compile(r"/api/event/list")
+ODDS_RESOURCE_TYPES = ("xhr", "fetch")
+
+
+class OddsInterceptor:
+    """
+    page.on("response") hook for the fast scraper. Filters on resource type,
+    URL and content-type before touching the body, decodes only event/list
+    payloads and merges their relations.odds into odds_cache as they arrive.
+    """
+
+    def __init__(self, odds_cache):
+        self.odds_cache = odds_cache
+        self.inspected = 0
+        self.decoded = 0
+        self.failed = 0
+        self.odds_merged = 0
+
+    def __call__(self, response):
+        self.inspected += 1
+        try:
+            if response.request.resource_type not in ODDS_RESOURCE_TYPES:
+                return
+            if not ODDS_URL_PATTERN.search(response.url) or response.status != 200:
+                return
+            if "json" not in response.headers.get("content-type", ""):
+                return
+            data = response.json()
+        except Exception as e:
+            self.failed += 1
+            print(f"DEBUG: Could not decode {response.url}: {e}")
+            return
+
+        self.decoded += 1
+        self.merge(data)
+
+    def merge(self, data):
+        """Merges relations.odds from a (possibly {status, data} wrapped) event/list payload."""
+        if not isinstance(data, dict):
+            return 0
+        if isinstance(data.get("data"), dict):
+            data = data["data"]
+        odds_map = (data.get("relations") or {}).get("odds")
+        if not isinstance(odds_map, dict):
+            return 0
+        for m_id, markets in odds_map.items():
+            self.odds_cache[str(m_id)] = markets
+        self.odds_merged += len(odds_map)
+        return len(odds_map)
+
+    def stats(self):
+        return {
+            "inspected": self.inspected,
+            "decoded": self.decoded,
+            "failed": self.failed,
+            "odds_merged": self.odds_merged,
+        }
+
 
 def scrape_tonybet_fast():
     matches_to_scrape = []
@@ -34,62 +276,16 @@ def scrape_tonybet_fast():
     # Store intercepted odds data: match_id -> list of markets
     odds_cache = {} 
 
-    with sync_playwright() as p:
-        launch_options = {
-            "headless": True,
-            "args": [
-                '--no-sandbox',
-                '--disable-setuid-sandbox',
-                '--disable-dev-shm-usage',
-                '--disable-blink-features=AutomationControlled'
-            ]
-        }
-        
-        browser = p.chromium.launch(**launch_options)
+    with browser_pool.lease("tonybet", block="fast", viewport={"width": 1920, "height": 1080}) as context:
+        page = context.new_page()
         
-        page = browser.new_page(
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            viewport={"width": 1920, "height": 1080}
-        )
-        
-        # Network Interceptor for API
-        def handle_response(response):
-            try:
-                # Try to parse EVERYTHING as JSON to find the odds
-                # print(f"DEBUG: Checking {response.url}")
-                try:
-                    data = response.json()
-                    # Check if this looks like the odds response
-                    is_odds = False
-                    if isinstance(data, dict):
-                        # Pattern 1: relations.odds
-                        if "relations" in data and "odds" in data["relations"]:
-                            is_odds = True
-                        # Pattern 2: events list
-                        elif "events" in data and len(data["events"]) > 0:
-                             # Check if first event has odds
-                             if "markets" in data["events"][0]:
-                                 is_odds = True
-                    
-                    if is_odds:
-                        print(f"DEBUG: !!! FOUND ODDS JSON !!! URL: {response.url}")
-                        if "relations" in data:
-                             for m_id, markets in data["relations"]["odds"].items():
-                                 odds_cache[str(m_id)] = markets
-                        elif "events" in data:
-                             # Different structure handling?
-                             pass
-                    
-                    # Log if it's a large match list even if not recognized
-                    if "event" in response.url and not is_odds:
-                        print(f"DEBUG: Json response from {response.url} (Keys: {list(data.keys()) if isinstance(data, dict) else 'List'})")
+        # Network Interceptor for API: only event/list JSON bodies are pulled from the browser
+        interceptor = OddsInterceptor(odds_cache)
+        page.on("response", interceptor)
 
-                except:
-                    pass
-            except Exception as e:
-                pass
-
-        page.on("response", handle_response)
+        # Registered before goto so requests started during load are tracked
+        scroller = ScrollDriver(page, 'div[data-test="teamSeoTitles"]', nudge=True)
+        phase_start = time.time()
         
         try:
             print("Navigating to Tonybet Live Football (CL)...")
@@ -109,13 +305,15 @@ def scrape_tonybet_fast():
             try:
                 # print("DEBUG: Waiting for selector...")
                 page.wait_for_selector('div[data-test="teamSeoTitles"]', timeout=30000)
-                # Wait a bit more for JSON to arrive
-                time.sleep(5) 
+                print(f"[Fast] First rows after {time.time() - phase_start:.2f}s")
+                # Wait for the event/list JSON and first render to settle instead of a fixed 5s
+                scroller.install()
+                scroller.wait_settled()
             except:
                 print(f"Warning: Timeout waiting for teamSeoTitles. Page Title: {page.title()}")
                 # print(f"DEBUG: Page Content Source (First 500 chars): {page.content()[:500]}")
             
-            print(f"DEBUG: Odds Cache Size (Passive): {len(odds_cache)}")
+            print(f"DEBUG: Odds Cache Size (Passive): {len(odds_cache)} {interceptor.stats()}")
             
             # --- ACTIVE FETCH FALLBACK ---
             # If passive capture failed, force a fetch from the browser context
@@ -148,15 +346,25 @@ def scrape_tonybet_fast():
                     
                     print(f"DEBUG: Executing fetch to {api_url}")
                     
-                    # Execute fetch in browser
-                    json_data = page.evaluate(f"""async () => {{
-                        try {{
-                            const response = await fetch("{api_url}");
-                            return await response.json();
-                        }} catch (e) {{
-                            return {{ error: e.toString() }};
-                        }}
-                    }}""")
+                    json_data = None
+                    if FETCH_MODE == "http":
+                        # Direct pooled HTTP call reusing this page's session cookies
+                        try:
+                            tonybet_api.load_cookies(context.cookies())
+                            json_data = tonybet_api.event_list(api_host, params)
+                        except Exception as e:
+                            print(f"DEBUG: HTTP fetch failed ({e}), falling back to in-page fetch")
+                    
+                    if json_data is None:
+                        # Execute fetch in browser
+                        json_data = page.evaluate(f"""async () => {{
+                            try {{
+                                const response = await fetch("{api_url}");
+                                return await response.json();
+                            }} catch (e) {{
+                                return {{ error: e.toString() }};
+                            }}
+                        }}""")
                     
                     if json_data:
                         # Handle Wrapped Response (common in Tonybet API: {status, data: {...}})
@@ -166,11 +374,8 @@ def scrape_tonybet_fast():
                             payload = json_data["data"]
                         
                         # PARSE ODDS
-                        if "relations" in payload and "odds" in payload["relations"]:
-                            odds_map = payload["relations"]["odds"]
-                            print(f"DEBUG: Found {len(odds_map)} odds markets.")
-                            for m_id, markets in odds_map.items():
-                                odds_cache[str(m_id)] = markets
+                        merged = interceptor.merge(json_data)
+                        print(f"DEBUG: Found {merged} odds markets.")
                         
                         # DEBUG KEYS
                         print(f"DEBUG: Payload Keys: {list(payload.keys())}")
@@ -191,235 +396,62 @@ def scrape_tonybet_fast():
                     print(f"DEBUG: Active Fetch Failed: {e}")
 
             print("Starting scrolling loop...")
-            
-            # SCROLLING PHASE - REDESIGNED
-            # Often sites behave better if you scroll to the specific list container
-            for i in range(7): # Increase iterations
-                # Scroll to bottom
-                page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                time.sleep(1)
-                
-                # Scroll a bit up and down to trigger intersection observers
-                page.evaluate("window.scrollBy(0, -500)")
-                time.sleep(0.5)
-                page.evaluate("window.scrollBy(0, 500)")
-                
-                # Report
-                count = page.locator('div[data-test="teamSeoTitles"]').count()
-                print(f"Scroll {i+1}: Found {count} matches")
-                time.sleep(2)
+
+            # Scroll until the row count stops growing (DOM + network settle, no fixed sleeps)
+            scroll_start = time.time()
+            scroller.scroll_to_end(
+                on_scroll=lambda i, n: print(f"Scroll {i+1}: Found {n} matches")
+            )
+            print(f"[Fast] Scrolling done in {time.time() - scroll_start:.2f}s ({scroller.report()})")
 
             print("Starting parsing...")
 
-            content = page.content()
-            soup = BeautifulSoup(content, 'html.parser')
-            
-            team_titles_containers = soup.find_all('div', attrs={'data-test': 'teamSeoTitles'})
-            
-            for team_titles_container in team_titles_containers:
+            if SNAPSHOT_DIR:
                 try:
-                    event_table_row = team_titles_container.find_parent('div', attrs={'data-test': 'eventTableRow'})
-                    if not event_table_row: continue
-                        
-                    link_el = event_table_row.find('a', attrs={'data-test': 'eventLink'})
-                    if not link_el: continue
-                        
-                    href = link_el.get('href')
-                    if 'football' not in href and 'soccer' not in href: continue
-                    if 'american-football' in href: continue # Explicitly exclude NFL/American Football
-                    
-                    # Extract Match ID from HREF for JSON lookup FIRST (before duplicate check)
-                    # URL samples: /live/football/1008007-laliga/7802786-osasuna-alaves
-                    parts = href.split('/')
-                    # Sometimes structure varies. Grab the last part that starts with a number?
-                    raw_id_part = parts[-1]
-                    match_db_id = raw_id_part.split('-')[0]
-                    
-                    # Verify ID extraction
-                    if not match_db_id.isdigit():
-                         # Try finding it in other parts
-                         match_id_match = re.search(r'/(\\d+)-', href)
-                         if match_id_match:
-                             match_db_id = match_id_match.group(1)
-                    
-                    # NOW check for duplicates using the actual match ID
-                    if match_db_id in scraped_ids: 
+                    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+                    snapshot_path = os.path.join(SNAPSHOT_DIR, f"fast_{int(time.time())}.html")
+                    with open(snapshot_path, 'w', encoding='utf-8') as f:
+                        f.write(page.content())
+                except Exception as e:
+                    print(f"DEBUG: Could not save page snapshot: {e}")
+
+            parse_start = time.time()
+
+            if PARSE_MODE == "bs4":
+                # Legacy path: full page HTML + BeautifulSoup tree
+                rows = extract_rows_bs(page.content())
+            else:
+                # One in-page pass that returns only the fields we use
+                rows = page.evaluate(EXTRACT_ROWS_JS)
+
+            print(f"Extracted {len(rows)} rows ({PARSE_MODE}) in {time.time() - parse_start:.2f}s")
+
+            # All markets decoded in one bulk pass instead of per row
+            ladders = decode_ladders(odds_cache)
+
+            for row in rows:
+                try:
+                    match_data = build_fast_match(row, base_origin, ladders)
+                    if not match_data:
                         continue
                     
-                    # Dynamic base URL
-                    full_url = f"{base_origin}{href}"
-                    
-                    # print(f"DEBUG: Processing {home_team} vs {away_team} (ID: {match_db_id})")
-                    
-                    # --- HTML Extraction (Teams, Score, Time) ---
-                    # (Keep existing robust logic)
-                    home_team = "Unknown Home"
-                    away_team = "Unknown Away"
-                    team_name_divs = team_titles_container.find_all('div', attrs={'data-test': 'teamName'})
-                    if len(team_name_divs) >= 2:
-                        home_team = team_name_divs[0].get_text(strip=True)
-                        away_team = team_name_divs[1].get_text(strip=True)
-                    else:
+                    # Check for duplicates using the actual match ID
+                    if match_data["id"] in scraped_ids:
                         continue
-                        
-                    home_team = re.sub(r'\d+$', '', home_team).strip()
-                    away_team = re.sub(r'\d+$', '', away_team).strip()
-
-                    home_score = "0"; away_score = "0"
-                    try:
-                        score_divs = team_titles_container.find_all('div', attrs={'data-test': 'teamScore'})
-                        if len(score_divs) >= 2:
-                            home_score = score_divs[0].get_text(strip=True)
-                            away_score = score_divs[1].get_text(strip=True)
-                    except: pass
-
-                    current_minute = "Not started"
-                    # Try multiple strategies to detect match time/status
-                    try:
-                         # Strategy 1: liveTimer element
-                         timer_el = event_table_row.find('div', attrs={'data-test': 'liveTimer'})
-                         if timer_el:
-                             row_text_raw = timer_el.get_text(strip=True)
-                             current_minute = "".join(row_text_raw.split())
-                         
-                         # Strategy 2: If still "Not started" but we have scores, look for halftime/other status
-                         if current_minute == "Not started" and (home_score != "0" or away_score != "0"):
-                             # Search for any text in the event row that might indicate halftime
-                             # This searches all text in the row for common halftime indicators
-                             row_text = event_table_row.get_text(separator=" ", strip=True).lower()
-                             
-                             # Check for halftime indicators
-                             if any(indicator in row_text for indicator in ["medio tiempo", "descanso", "half time", "ht", "halftime"]):
-                                 current_minute = "Half time"
-                             # Check for full time
-                             elif any(indicator in row_text for indicator in ["finalizado", "final", "ft", "full time"]):
-                                 current_minute = "End"
-                             else:
-                                 # If we have scores but no time info, assume it's in play
-                                 current_minute = "In play"
-                    except: pass
-                    
-                    # HTML parsing only - no API fallbacks
-                    
-                    # League Header
-                    league_header = {"name": "", "flag": ""}
-                    try:
-                        header_el = event_table_row.find_previous('div', attrs={'data-test': 'eventTableHeader'})
-                        if header_el:
-                            league_link = header_el.find('a', attrs={'data-test': 'leagueLink'})
-                            if league_link: league_header["name"] = league_link.get_text(strip=True)
-                            images = header_el.find_all('img')
-                            if images:
-                                img_el = images[-1]
-                                raw_src = img_el.get('src') or ""
-                                if raw_src.startswith('/'): league_header["flag"] = f"https://tonybet.es{raw_src}"
-                                else: league_header["flag"] = raw_src
-                    except: pass
-
-                    # --- ODDS EXTRACTION (Hybrid) ---
-                    # Default: None
-                    odds_dict = {
-                        "over_0_5_odds": None, "over_1_odds": None,
-                        "over_1_5_odds": None, "over_2_odds": None,
-                        "over_2_5_odds": None, "over_3_odds": None,
-                        "combined_odds_3_5": None, "over_4_odds": None,
-                        "combined_odds_4_5": None, "over_5_odds": None,
-                        "over_5_5_odds": None, "over_6_odds": None,
-                        "over_6_5_odds": None, "over_7_odds": None,
-                        "over_7_5_odds": None, "over_8_odds": None,
-                        "over_8_5_odds": None # Added per request
-                    }
-                    
-                    # Look up in JSON cache
-                    if match_db_id in odds_cache:
-                        markets = odds_cache[match_db_id]
-                        for market in markets:
-                            # Total Goals Market (Id 18)
-                            if market.get("vendorMarketId") == 18:
-                                specifiers = market.get("specifiers", "")
-                                # Parse total=X.X
-                                total_match = re.search(r'total=([0-9.]+)', specifiers)
-                                if total_match:
-                                    try:
-                                        line_val = float(total_match.group(1))
-                                        
-                                        # Find 'Over' outcome (Id 12 based on analysis)
-                                        # But let's be robust: usually 12 is Over?
-                                        # Fallback check:
-                                        # If outcomes[0].id == 12?
-                                        outcomes = market.get("outcomes", [])
-                                        over_odd = None
-                                        
-                                        for out in outcomes:
-                                            # Assuming 12 is Over.
-                                            # Alternatively, check 'active': 1
-                                            if str(out.get("vendorOutcomeId")) == "12":
-                                                over_odd = out.get("odds")
-                                                break
-                                        
-                                        if over_odd:
-                                            # Map to keys
-                                            if line_val == 0.5: odds_dict["over_0_5_odds"] = over_odd
-                                            elif line_val == 1.0: odds_dict["over_1_odds"] = over_odd
-                                            elif line_val == 1.5: odds_dict["over_1_5_odds"] = over_odd
-                                            elif line_val == 2.0: odds_dict["over_2_odds"] = over_odd
-                                            elif line_val == 2.5: odds_dict["over_2_5_odds"] = over_odd
-                                            elif line_val == 3.0: odds_dict["over_3_odds"] = over_odd
-                                            elif line_val == 3.5: odds_dict["combined_odds_3_5"] = over_odd
-                                            elif line_val == 4.0: odds_dict["over_4_odds"] = over_odd
-                                            elif line_val == 4.5: odds_dict["combined_odds_4_5"] = over_odd
-                                            elif line_val == 5.0: odds_dict["over_5_odds"] = over_odd
-                                            elif line_val == 5.5: odds_dict["over_5_5_odds"] = over_odd
-                                            elif line_val == 6.0: odds_dict["over_6_odds"] = over_odd
-                                            elif line_val == 6.5: odds_dict["over_6_5_odds"] = over_odd
-                                            elif line_val == 7.0: odds_dict["over_7_odds"] = over_odd
-                                            elif line_val == 7.5: odds_dict["over_7_5_odds"] = over_odd
-                                            elif line_val == 8.0: odds_dict["over_8_odds"] = over_odd
-                                            elif line_val == 8.5: odds_dict["over_8_5_odds"] = over_odd
-
-                                    except: pass
-
-                    # Construct Final Object
-                    match_data = {
-                        "id": str(match_db_id),
-                        "league": "Live", 
-                        "home_team": home_team,
-                        "away_team": away_team,
-                        "teams": f"{home_team} vs {away_team}",
-                        "url": full_url,
-                        "start_time": datetime.datetime.now().isoformat(),
-                        "current_minute": current_minute,
-                        "home_score": home_score,
-                        "away_score": away_score,
-                        "tournament": {
-                            "name": "Live Matches", "id": 0, "urn_id": "0"
-                        },
-                        "league_header": league_header,
-                        "competitors": {
-                            "home": {"name": home_team, "logo": get_logo_url(home_team), "urn_id": "0"},
-                            "away": {"name": away_team, "logo": get_logo_url(away_team), "urn_id": "0"}
-                        },
-                        **odds_dict # Unpack odds
-                    }
-
-                    # Filter None only if requested? Or keep keys for structure consistency?
-                    # Original scraper filtered None.
-                    # matches_to_scrape.append({k: v for k, v in match_data.items() if v is not None})
-                    # But the frontend interface expects optional keys.
-                    # It's cleaner to return keys even if null, or filter.
-                    # "Filtering out matches with NO ODDS" was in old logic.
-                    # If JSON found, we likely have odds.
+
                     matches_to_scrape.append(match_data)
-                    scraped_ids.add(match_db_id)  # Use match_db_id instead of href
+                    scraped_ids.add(match_data["id"])
                     
                 except Exception as e:
                     # print(f"Error processing row: {e}")
                     continue
 
+            print(f"[Fast] Response interceptor: {interceptor.stats()}")
+
         except Exception as e:
             print(f"Global error in fast scraper: {e}")
         finally:
-            browser.close()
+            page.close()
             
     return matches_to_scrape
 
@@ -1,6 +1,6 @@
 from playwright.sync_api import sync_playwright
+from request_filter import RequestFilter
 import json
-import time
 import re
 
 OUTPUT_FILE = "flashscore_live.json"
@@ -75,6 +75,7 @@ def scrape_flashscore():
             user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
             viewport={"width": 1920, "height": 1080}
         )
+        request_filter = RequestFilter("flashscore").install(context)
         
         # 1. Get Live Matches List
         page = context.new_page()
@@ -86,7 +87,8 @@ def scrape_flashscore():
         
         try:
             page.locator("div.filters__tab:has-text('Directo')").click()
-            time.sleep(3)
+            # Playwright wait (not time.sleep) so routed requests keep flowing
+            page.wait_for_timeout(3000)
         except:
             print("Could not click Directo tab")
 
@@ -145,8 +147,10 @@ def scrape_flashscore():
             url = f"https://www.flashscore.es/partido/{mid}/#/resumen-del-partido/estadisticas-del-partido/0"
             try:
                 p_match.goto(url, timeout=30000)
-                # Wait enough time for WS connection and initial data push
-                time.sleep(6) 
+                # Wait enough time for WS connection and initial data push.
+                # Must be a Playwright wait: WS frames and routed requests are only
+                # dispatched while we are inside a Playwright call
+                p_match.wait_for_timeout(6000)
             except Exception as e:
                 print(f"  Error loading match {mid}: {e}")
             
@@ -159,6 +163,7 @@ def scrape_flashscore():
             results.append(match_data)
             p_match.close()
             
+        print(request_filter.report())
         browser.close()
         
     # Save Results
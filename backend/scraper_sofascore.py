@@ -1,6 +1,6 @@
 from playwright.sync_api import sync_playwright
+from request_filter import RequestFilter
 import json
-import time
 import os
 import datetime
 
@@ -22,13 +22,14 @@ def scrape_sofascore():
             user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
             viewport={"width": 1920, "height": 1080}
         )
+        request_filter = RequestFilter("sofascore").install(context)
         page = context.new_page()
 
         # 1. Visit main page first to get cookies/tokens
         print("visiting sofascore.com to prime cookies...")
         try:
             page.goto("https://www.sofascore.com", timeout=30000)
-            time.sleep(3) # Wait for initial load
+            page.wait_for_timeout(3000) # Wait for initial load (keeps routed requests flowing)
         except Exception as e:
             print(f"Error loading main page: {e}")
 
@@ -39,6 +40,7 @@ def scrape_sofascore():
             response = page.request.get(LIVE_EVENTS_URL)
             if response.status != 200:
                 print(f"Failed to fetch live events. Status: {response.status}")
+                print(request_filter.report())
                 browser.close()
                 return
 
@@ -48,6 +50,7 @@ def scrape_sofascore():
 
         except Exception as e:
             print(f"Error fetching live events: {e}")
+            print(request_filter.report())
             browser.close()
             return
 
@@ -80,7 +83,7 @@ def scrape_sofascore():
             try:
                 stats_url = get_event_stats_url(event_id)
                 # Add a small delay to be polite and avoid rate limits
-                time.sleep(0.5) 
+                page.wait_for_timeout(500)
                 
                 stats_res = page.request.get(stats_url)
                 
@@ -128,6 +131,7 @@ def scrape_sofascore():
         except Exception as e:
             print(f"Error saving to file: {e}")
 
+        print(request_filter.report())
         browser.close()
 
 if __name__ == "__main__":
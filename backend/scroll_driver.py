@@ -0,0 +1,132 @@
+import time
+
+# Installed once per page: counts rows and remembers when the DOM last changed
+OBSERVER_JS = """(rowSelector) => {
+    if (window.__scrollWatch) return window.__scrollWatch.count();
+    const watch = {
+        last: performance.now(),
+        count: () => document.querySelectorAll(rowSelector).length
+    };
+    new MutationObserver(() => { watch.last = performance.now(); })
+        .observe(document.body, {childList: true, subtree: true});
+    window.__scrollWatch = watch;
+    return watch.count();
+}"""
+
+# Resolves once the DOM has been quiet for `quiet` ms
+DOM_QUIET_JS = "(quiet) => performance.now() - window.__scrollWatch.last >= quiet"
+
+SCROLL_JS = """([rowSelector, nudge]) => {
+    const rows = document.querySelectorAll(rowSelector);
+    if (rows.length > 0) rows[rows.length - 1].scrollIntoView();
+    window.scrollTo(0, document.body.scrollHeight);
+    // Small up/down nudge re-triggers intersection observers on some lists
+    if (nudge) { window.scrollBy(0, -500); window.scrollBy(0, 500); }
+    return rows.length;
+}"""
+
+# Only data requests count as "loading"; images/fonts never block the scroll loop
+TRACKED_RESOURCE_TYPES = ("xhr", "fetch", "document")
+
+
+class ScrollDriver:
+    """
+    Scrolls a lazy-loaded list until it stops growing, waiting on real signals
+    instead of fixed sleeps: DOM mutations (MutationObserver) and in-flight
+    XHR/fetch requests (e.g. the event/list calls behind the rows).
+    Timings per phase are kept in self.timings.
+    """
+
+    def __init__(self, page, row_selector, quiet_ms=400, settle_timeout_ms=5000,
+                 max_scrolls=30, stable_rounds=2, nudge=False):
+        self.page = page
+        self.row_selector = row_selector
+        self.quiet_ms = quiet_ms
+        self.settle_timeout_ms = settle_timeout_ms
+        self.max_scrolls = max_scrolls
+        self.stable_rounds = stable_rounds
+        self.nudge = nudge
+        self.inflight = set()
+        self.timings = {"settle": 0.0, "scroll": 0.0, "scrolls": 0, "rows": 0}
+
+        page.on("request", self._on_request)
+        page.on("requestfinished", self._on_request_done)
+        page.on("requestfailed", self._on_request_done)
+
+    def _on_request(self, request):
+        if request.resource_type in TRACKED_RESOURCE_TYPES:
+            self.inflight.add(request)
+
+    def _on_request_done(self, request):
+        self.inflight.discard(request)
+
+    def install(self):
+        return self.page.evaluate(OBSERVER_JS, self.row_selector)
+
+    def row_count(self):
+        return self.page.evaluate("() => window.__scrollWatch.count()")
+
+    def wait_settled(self, timeout_ms=None):
+        """
+        Waits until the DOM has been quiet for quiet_ms and no tracked request
+        is in flight. Returns False if it timed out (the list is used as-is).
+        """
+        timeout_ms = timeout_ms or self.settle_timeout_ms
+        start = time.time()
+        deadline = start + timeout_ms / 1000
+        settled = False
+        try:
+            while True:
+                remaining = max(1, int((deadline - time.time()) * 1000))
+                self.page.wait_for_function(DOM_QUIET_JS, arg=self.quiet_ms, polling=100, timeout=remaining)
+                if not self.inflight:
+                    settled = True
+                    break
+                if time.time() >= deadline:
+                    break
+                # Requests still running: give them a moment (events are pumped while we wait)
+                self.page.wait_for_timeout(50)
+        except Exception:
+            pass
+        self.timings["settle"] += time.time() - start
+        return settled
+
+    def scroll_to_end(self, max_rows=None, on_scroll=None):
+        """
+        Scrolls until the row count stops growing for stable_rounds settled
+        scrolls, max_rows is reached or max_scrolls is hit. on_scroll(i, count)
+        is called after every settled scroll (used for incremental parsing).
+        """
+        self.install()
+        self.wait_settled()
+
+        last_count = self.row_count()
+        stable = 0
+        for i in range(self.max_scrolls):
+            if max_rows and last_count >= max_rows:
+                break
+
+            start = time.time()
+            self.page.evaluate(SCROLL_JS, [self.row_selector, self.nudge])
+            self.timings["scroll"] += time.time() - start
+            self.timings["scrolls"] += 1
+
+            self.wait_settled()
+            count = self.row_count()
+            if on_scroll:
+                on_scroll(i, count)
+
+            if count > last_count:
+                stable = 0
+                last_count = count
+            else:
+                stable += 1
+                if stable >= self.stable_rounds:
+                    break
+
+        self.timings["rows"] = last_count
+        return last_count
+
+    def report(self):
+        t = self.timings
+        return f"{t['scrolls']} scrolls, {t['rows']} rows, settle {t['settle']:.2f}s, scroll {t['scroll']:.2f}s"
@@ -0,0 +1,298 @@
+import gzip
+import hashlib
+import json
+import threading
+import time
+from collections import deque
+
+from fastapi import Response
+
+try:
+    import brotli
+except ImportError:  # Optional: without it we only serve gzip/identity
+    brotli = None
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 8
+
+
+def serialize_payload(payload):
+    # Same compact encoding FastAPI's JSONResponse uses
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class Snapshot:
+    """
+    One published version of an API payload.
+    The JSON body, its gzip/brotli variants and the ETag are all built once
+    at publish time; never mutate after publishing.
+    """
+    __slots__ = ("version", "payload", "body", "gzip_body", "br_body", "etag", "published_at", "changes_cache")
+
+    def __init__(self, version, payload):
+        self.version = version
+        self.payload = payload
+        self.body = serialize_payload(payload)
+        self.gzip_body = gzip.compress(self.body, compresslevel=GZIP_LEVEL)
+        self.br_body = brotli.compress(self.body, quality=BROTLI_QUALITY) if brotli else None
+        self.etag = f'"{hashlib.sha1(self.body).hexdigest()}"'
+        self.published_at = time.time()
+        # since_version -> serialized changes body (see SnapshotStore.changes_since)
+        self.changes_cache = {}
+
+
+class SnapshotIndex:
+    """
+    Groups of the matches of one published Snapshot (e.g. league -> matches),
+    built once at publish time. Each group / single match is serialized the
+    first time it is requested and then cached here, so lookups never scan
+    or re-serialize the whole list. Never mutate the groups after building.
+    """
+    __slots__ = ("version", "status", "group_field", "groups", "items", "_snapshots")
+
+    def __init__(self, version=0, status="ready", groups=None, items=None, group_field="group"):
+        self.version = version
+        self.group_field = group_field
+        self.status = status
+        self.groups = groups or {}  # group -> [match, ...]
+        self.items = items or {}  # (group, item key) -> match
+        self._snapshots = {}
+
+    def _cached(self, cache_key, build):
+        snapshot = self._snapshots.get(cache_key)
+        if snapshot is None:
+            # Two readers may build the same one at once; both results are identical
+            snapshot = Snapshot(self.version, build())
+            self._snapshots[cache_key] = snapshot
+        return snapshot
+
+    def group(self, group):
+        """Snapshot with the matches of one group, or None if unknown."""
+        matches = self.groups.get(group)
+        if matches is None:
+            return None
+        return self._cached(("group", group), lambda: {
+            self.group_field: group, "matches": matches, "count": len(matches),
+            "status": self.status, "version": self.version
+        })
+
+    def item(self, group, key):
+        """Snapshot with a single match, or None if unknown."""
+        match = self.items.get((group, key))
+        if match is None:
+            return None
+        return self._cached(("item", group, key), lambda: {
+            "match": match, "status": self.status, "version": self.version
+        })
+
+
+class SourceState:
+    """
+    Raw scraper output and its scraping flag, swapped as one reference by the
+    source's (single) writer job. Never mutated, so readers need no lock.
+    """
+    __slots__ = ("matches", "scraping")
+
+    def __init__(self, matches=(), scraping=False):
+        self.matches = tuple(matches)
+        self.scraping = scraping
+
+    def replace(self, matches=None, scraping=None):
+        return SourceState(
+            self.matches if matches is None else matches,
+            self.scraping if scraping is None else scraping
+        )
+
+
+def diff_matches(old_matches, new_matches, key="id", ignore_fields=()):
+    """
+    Diffs two match lists keyed by `key`.
+    Returns (added, changed, removed_keys); fields in ignore_fields don't count as a change.
+    """
+    def comparable(m):
+        if not ignore_fields:
+            return m
+        return {k: v for k, v in m.items() if k not in ignore_fields}
+
+    old_by_key = {m.get(key): m for m in old_matches}
+    new_keys = set()
+    added = []
+    changed = []
+
+    for m in new_matches:
+        k = m.get(key)
+        new_keys.add(k)
+        previous = old_by_key.get(k)
+        if previous is None:
+            added.append(m)
+        elif previous is not m and comparable(previous) != comparable(m):
+            changed.append(m)
+
+    removed = [k for k in old_by_key if k not in new_keys]
+    return added, changed, removed
+
+
+class SnapshotStore:
+    """
+    Holds the latest Snapshot of one cache. Writers publish a brand new
+    snapshot, readers just grab the current reference.
+
+    With key set, the last `history` snapshots are kept so clients can ask
+    for the matches that changed since a version they already have.
+    Listeners added with on_publish(callback) get (previous, snapshot) after
+    every new version, on the publishing thread (in version order).
+    """
+
+    def __init__(self, name, initial_payload=None, key=None, history=0, ignore_fields=()):
+        self.name = name
+        self.key = key
+        self.ignore_fields = tuple(ignore_fields)
+        self._lock = threading.Lock()  # Serializes writers only
+        self._version = 0
+        self._current = Snapshot(0, {**(initial_payload or {}), "version": 0})
+        self._history = deque([self._current], maxlen=max(history, 1))
+        self._listeners = []
+
+    def publish(self, payload):
+        with self._lock:
+            current = self._current
+            # Same content as what is already out there: keep version and ETag stable
+            if {**payload, "version": current.version} == current.payload:
+                return current
+
+            self._version += 1
+            snapshot = Snapshot(self._version, {**payload, "version": self._version})
+            self._history.append(snapshot)
+            self._current = snapshot
+
+            # Still under the writer lock so listeners see versions in order
+            for callback in self._listeners:
+                try:
+                    callback(current, snapshot)
+                except Exception as e:
+                    print(f"[Snapshots] Listener error on {self.name}: {e}")
+        return snapshot
+
+    def on_publish(self, callback):
+        self._listeners.append(callback)
+
+    def current(self):
+        return self._current
+
+    @property
+    def version(self):
+        return self._current.version
+
+    def get(self, version):
+        for snapshot in self._history:
+            if snapshot.version == version:
+                return snapshot
+        return None
+
+    def diff(self, previous, snapshot):
+        """(added, changed, removed) between two snapshots of this store."""
+        return diff_matches(
+            previous.payload.get("matches", []), snapshot.payload.get("matches", []),
+            key=self.key, ignore_fields=self.ignore_fields
+        )
+
+    def changes_since(self, since):
+        """
+        Serialized body with the matches added/changed/removed since `since`.
+        Falls back to the full match list ("full": true) when that version is
+        no longer in history. Bodies are cached on the current snapshot.
+        """
+        current = self._current
+        base = self.get(since) if since is not None else None
+        # Every unknown version shares one cached fallback body
+        cache_key = base.version if base is not None else None
+
+        cached = current.changes_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        payload = current.payload
+
+        if base is None:
+            changes = {
+                "full": True,
+                "version": current.version,
+                "matches": payload.get("matches", []),
+                "count": payload.get("count", 0),
+                "status": payload.get("status"),
+            }
+        else:
+            added, changed, removed = self.diff(base, current)
+            changes = {
+                "full": False,
+                "since": since,
+                "version": current.version,
+                "added": added,
+                "changed": changed,
+                "removed": removed,
+                "count": payload.get("count", 0),
+                "status": payload.get("status"),
+            }
+
+        body = serialize_payload(changes)
+        current.changes_cache[cache_key] = body
+        return body
+
+
+def etag_matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def pick_encoding(accept_encoding):
+    """Returns 'br', 'gzip' or None based on the client's Accept-Encoding."""
+    accepted = set()
+    for part in (accept_encoding or "").lower().split(","):
+        token, _, params = part.strip().partition(";")
+        params = params.replace(" ", "")
+        if params in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        if token:
+            accepted.add(token)
+
+    if brotli and "br" in accepted:
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+
+def snapshot_response(snapshot, request):
+    """
+    Serves a Snapshot as-is: 304 when the client's ETag is current,
+    otherwise the best pre-compressed body the client accepts.
+    """
+    headers = {
+        "ETag": snapshot.etag,
+        "Vary": "Accept-Encoding",
+        "Cache-Control": "no-cache",
+    }
+
+    if etag_matches(request.headers.get("if-none-match"), snapshot.etag):
+        return Response(status_code=304, headers=headers)
+
+    encoding = pick_encoding(request.headers.get("accept-encoding"))
+    if encoding == "br":
+        headers["Content-Encoding"] = "br"
+        body = snapshot.br_body
+    elif encoding == "gzip":
+        headers["Content-Encoding"] = "gzip"
+        body = snapshot.gzip_body
+    else:
+        body = snapshot.body
+
+    return Response(content=body, media_type="application/json", headers=headers)
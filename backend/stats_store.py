@@ -0,0 +1,86 @@
+import json
+import os
+import threading
+import time
+
+from team_matcher import TeamMatcher
+
+# Same file the 365 scraper used to hand over through; now only a warm-restart snapshot
+STATS_FILE = "365scores_live.json"
+
+
+def persist_enabled():
+    # Read on every publish, not at import: job_runner workers get their env
+    # (STATS_365_PERSIST=0) only after this module was imported under spawn
+    return os.getenv("STATS_365_PERSIST", "1") != "0"
+
+
+class StatsSnapshot:
+    """One published set of 365Scores records plus its team-name index. Never mutated."""
+    __slots__ = ("version", "records", "index", "published_at")
+
+    def __init__(self, version, records):
+        self.version = version
+        self.records = records
+        self.index = TeamMatcher(records)
+        self.published_at = time.time()
+
+
+class StatsStore:
+    """
+    In-memory, versioned 365Scores stats shared between the 365 scraper
+    (writer) and the fast-odds merge (reader). Readers take the current
+    snapshot reference, so there is no file polling and no torn reads.
+    Optionally persisted with write-to-temp + rename for warm restarts.
+    """
+
+    def __init__(self, path=STATS_FILE, persist=None):
+        self.path = path
+        self.persist = persist  # None = follow STATS_365_PERSIST
+        self._lock = threading.Lock()  # Serializes writers only
+        self._current = StatsSnapshot(0, [])
+
+    def current(self):
+        return self._current
+
+    @property
+    def version(self):
+        return self._current.version
+
+    def publish(self, records):
+        with self._lock:
+            snapshot = StatsSnapshot(self._current.version + 1, list(records))
+            self._current = snapshot
+        if self.persist if self.persist is not None else persist_enabled():
+            self.save(snapshot.records)
+        return snapshot
+
+    def save(self, records):
+        # Per-process temp name, so two writers never share (and tear) one temp file
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(records, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)  # Atomic: readers never see half a file
+        except Exception as e:
+            print(f"[Stats] Error saving snapshot: {e}")
+
+    def load_from_disk(self):
+        """Warm restart: publish the last persisted snapshot, if any."""
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                records = json.load(f)
+        except Exception as e:
+            print(f"[Stats] Error loading snapshot: {e}")
+            return None
+        with self._lock:
+            snapshot = StatsSnapshot(self._current.version + 1, records)
+            self._current = snapshot
+        print(f"[Stats] Loaded {len(records)} stats records from {self.path}.")
+        return snapshot
+
+
+# Shared by the 365 scraper and main.py
+stats_store = StatsStore()
@@ -0,0 +1,104 @@
+import difflib
+from collections import defaultdict
+
+# Same threshold the old brute-force merge used
+MATCH_THRESHOLD = 0.65
+
+# How many candidates (ranked by shared trigrams) get the exact difflib scoring
+MAX_CANDIDATES = 12
+
+
+def normalize_name(name):
+    if not name: return ""
+    name = name.lower()
+    # Remove common suffixes/prefixes
+    replacements = [" fc", "fc ", "fk ", " u21", " u20", " u19", "ca ", " cd", "cf ", " sc", " women", " (w)"]
+    for r in replacements:
+        name = name.replace(r, "")
+    return name.strip()
+
+
+def trigrams(text):
+    """
+    Returns the set of padded character trigrams of an already normalized name.
+    Padding lets short names ("psg", "aek") still produce usable grams.
+    """
+    if not text:
+        return set()
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TeamMatcher:
+    """
+    Inverted trigram index over 365Scores records (homeTeam / awayTeam).
+
+    Built once per stats file change. Each lookup only runs difflib on the
+    few records that share the most trigrams with the query, instead of
+    scoring every record like the old O(N x M) loop.
+    """
+
+    def __init__(self, records, max_candidates=MAX_CANDIDATES):
+        self.records = list(records)
+        self.max_candidates = max_candidates
+        self.home_names = []
+        self.away_names = []
+        # gram -> list of record positions (separate postings per side)
+        self.home_postings = defaultdict(list)
+        self.away_postings = defaultdict(list)
+
+        for pos, s in enumerate(self.records):
+            home = normalize_name(s.get('homeTeam', ''))
+            away = normalize_name(s.get('awayTeam', ''))
+            self.home_names.append(home)
+            self.away_names.append(away)
+            for g in trigrams(home):
+                self.home_postings[g].append(pos)
+            for g in trigrams(away):
+                self.away_postings[g].append(pos)
+
+    def __len__(self):
+        return len(self.records)
+
+    def candidates(self, home, away):
+        """Record positions sharing the most trigrams with (home, away)."""
+        hits = defaultdict(int)
+        for g in trigrams(home):
+            for pos in self.home_postings.get(g, ()):
+                hits[pos] += 1
+        for g in trigrams(away):
+            for pos in self.away_postings.get(g, ()):
+                hits[pos] += 1
+
+        if not hits:
+            return []
+
+        ranked = sorted(hits, key=lambda pos: (-hits[pos], pos))[:self.max_candidates]
+        # Score in original order so ties resolve like the old loop (first wins)
+        ranked.sort()
+        return ranked
+
+    def best_match(self, home_team, away_team, threshold=MATCH_THRESHOLD):
+        """
+        Returns (record, score) for the best 365Scores record, or (None, score)
+        when nothing clears the threshold.
+        """
+        home_fast = normalize_name(home_team)
+        away_fast = normalize_name(away_team)
+
+        best_score = 0
+        best_match = None
+
+        for pos in self.candidates(home_fast, away_fast):
+            ratio_home = difflib.SequenceMatcher(None, home_fast, self.home_names[pos]).ratio()
+            ratio_away = difflib.SequenceMatcher(None, away_fast, self.away_names[pos]).ratio()
+
+            avg_ratio = (ratio_home + ratio_away) / 2
+
+            if avg_ratio > best_score:
+                best_score = avg_ratio
+                best_match = self.records[pos]
+
+        if best_score > threshold:
+            return best_match, best_score
+        return None, best_score
@@ -0,0 +1,43 @@
+import odds_ladder
+from odds_ladder import decode_ladder, legacy_odds
+
+
+def total_market(line, over, under=None):
+    outcomes = [{"vendorOutcomeId": 12, "odds": over}]
+    if under is not None:
+        outcomes.append({"vendorOutcomeId": 13, "odds": under})
+    return {"vendorMarketId": 18, "specifiers": f"total={line}", "outcomes": outcomes}
+
+
+def test_ladder_sorted_by_line():
+    markets = [total_market(3.5, 2.6, 1.45), total_market(1.5, 1.2, 4.1), {"vendorMarketId": 1, "outcomes": []}]
+    assert decode_ladder(markets) == [(1.5, 1.2, 4.1), (3.5, 2.6, 1.45)]
+
+
+def test_duplicate_line_last_wins():
+    before = odds_ladder.duplicate_lines
+    ladder = decode_ladder([total_market(2.5, 1.9, 1.9), total_market(2.5, 2.05, 1.75)])
+    assert ladder == [(2.5, 2.05, 1.75)]
+    assert odds_ladder.duplicate_lines == before + 1
+
+
+def test_duplicate_line_missing_side_keeps_earlier():
+    under_only = {"vendorMarketId": 18, "specifiers": "total=2.5", "outcomes": [{"vendorOutcomeId": 13, "odds": 1.8}]}
+    assert decode_ladder([total_market(2.5, 1.9, 1.9), under_only]) == [(2.5, 1.9, 1.8)]
+    assert decode_ladder([under_only, total_market(2.5, 2.0)]) == [(2.5, 2.0, 1.8)]
+
+
+def test_legacy_keys():
+    odds = legacy_odds([(2.5, 2.05, 1.75), (3.5, 2.6, None), (9.5, 15.0, None)])
+    assert odds["over_2_5_odds"] == 2.05
+    assert odds["combined_odds_3_5"] == 2.6
+    assert odds["over_3_odds"] is None
+    assert "over_9_5_odds" not in odds
+
+
+if __name__ == "__main__":
+    test_ladder_sorted_by_line()
+    test_duplicate_line_last_wins()
+    test_duplicate_line_missing_side_keeps_earlier()
+    test_legacy_keys()
+    print("OK")
@@ -0,0 +1,152 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from tonybet_api import TonybetApiClient
+from scrapper_oriol import parse_oriol_response, ORIOL_PARAMS
+from prematch_scraper import parse_prematch_response, PREMATCH_PARAMS
+
+# Minimal event/list response in the shape platform.tonybet.* returns
+STUB_RESPONSE = {
+    "status": "ok",
+    "data": {
+        "items": [
+            {"id": 101, "competitor1Id": 1, "competitor2Id": 2, "league": 7, "time": "2026-01-02 20:00:00"},
+            {"id": 102, "competitor1Id": 3, "competitor2Id": 4, "league": 7, "time": "2026-01-02 22:00:00"},
+        ],
+        "relations": {
+            "competitors": [
+                {"id": 1, "name": "Real Madrid"}, {"id": 2, "name": "Barcelona"},
+                {"id": 3, "name": "Arsenal"}, {"id": 4, "name": "Chelsea"},
+            ],
+            "league": [{"id": 7, "name": "Stub League"}],
+            "odds": {
+                "101": [{"id": 1, "vendorMarketId": 18, "name": "Total", "specifiers": "total=2.5",
+                         "outcomes": [{"id": 11, "name": "Over", "odds": 1.85}], "status": 1}],
+            },
+        },
+    },
+}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    seen_ports = set()
+    seen_queries = []
+
+    def do_GET(self):
+        StubHandler.seen_ports.add(self.client_address[1])
+        parsed = urlparse(self.path)
+        StubHandler.seen_queries.append(parse_qs(parsed.query))
+        if parsed.path != "/api/event/list":
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = json.dumps(STUB_RESPONSE).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_event_list_against_stub():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    api_host = f"http://127.0.0.1:{server.server_address[1]}"
+
+    client = TonybetApiClient(http2=False, prime_cookies=False)
+    try:
+        t0 = time.perf_counter()
+        for _ in range(20):
+            json_data = client.event_list(api_host, ORIOL_PARAMS)
+        elapsed = time.perf_counter() - t0
+
+        matches = parse_oriol_response(json_data)
+        assert [m["id"] for m in matches] == ["101", "102"]
+        assert matches[0]["home_team"] == "Real Madrid"
+        assert matches[0]["league"] == "Stub League"
+        assert matches[0]["markets"][0]["outcomes"][0]["odds"] == 1.85
+
+        # Repeated query keys (relations=...) must survive the encoding
+        assert len(StubHandler.seen_queries[-1]["relations"]) == 10
+        # Keep-alive: 20 sequential calls share one connection
+        assert len(StubHandler.seen_ports) == 1
+
+        print(f"20 event/list calls in {elapsed * 1000:.1f} ms over {len(StubHandler.seen_ports)} connection(s)")
+    finally:
+        client.close()
+        server.shutdown()
+
+
+class PagedStubHandler(BaseHTTPRequestHandler):
+    """250 prematch events served 'limit' at a time via ?page=N."""
+    protocol_version = "HTTP/1.1"
+    total = 250
+    pages_served = []
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        limit = int(query["limit"][0])
+        page = int(query.get("page", ["1"])[0])
+        PagedStubHandler.pages_served.append(page)
+
+        ids = range(1000 + (page - 1) * limit, 1000 + min(page * limit, self.total))
+        body = json.dumps({
+            "status": "ok",
+            "data": {
+                "items": [{"id": i, "competitor1Id": 1, "competitor2Id": i, "time": "2026-01-02 20:00:00"} for i in ids],
+                "relations": {
+                    # Team 1 shows up on every page; must not be duplicated by the merge
+                    "competitors": [{"id": 1, "name": "Home FC"}] + [{"id": i, "name": f"Away {i}"} for i in ids],
+                    "odds": {str(i): [{"vendorMarketId": 18, "specifiers": "total=2.5",
+                                       "outcomes": [{"vendorOutcomeId": 12, "odds": 1.9}]}] for i in ids},
+                },
+            },
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_event_list_pages_against_stub():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), PagedStubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    api_host = f"http://127.0.0.1:{server.server_address[1]}"
+
+    client = TonybetApiClient(http2=False, prime_cookies=False)
+    try:
+        json_data = client.event_list_pages(api_host, PREMATCH_PARAMS, page_size=100, concurrency=2)
+        items = json_data["data"]["items"]
+        assert len(items) == 250
+        assert len({item["id"] for item in items}) == 250
+        assert len(json_data["data"]["relations"]["competitors"]) == 251
+        assert len(json_data["data"]["relations"]["odds"]) == 250
+        # Waves of 2: page 3 is short, so nothing after the [3, 4] wave is requested
+        assert sorted(PagedStubHandler.pages_served) == [1, 2, 3, 4]
+
+        matches = parse_prematch_response(json_data)
+        assert len(matches) == 250
+        assert matches[0]["teams"] == "Home FC vs Away 1000"
+        assert matches[0]["over_2_5_odds"] == "1.9"
+        assert matches[0]["event_time"] == "20:00"
+    finally:
+        client.close()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    test_event_list_against_stub()
+    test_event_list_pages_against_stub()
+    print("OK")
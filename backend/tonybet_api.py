@@ -0,0 +1,262 @@
+import asyncio
+import os
+import threading
+import time
+
+import httpx
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# "http" = call platform.tonybet.* directly, "browser" = old page.evaluate(fetch) path
+FETCH_MODE = os.getenv("TONYBET_FETCH_MODE", "http").lower().strip()
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+EVENT_LIST_PATH = "/api/event/list"
+
+# Re-prime cookies through the browser after this long (or on 401/403)
+COOKIE_TTL = 30 * 60
+REQUEST_TIMEOUT = 20
+
+# event/list paging: limit + page, several pages in flight at once
+PAGE_PARAM = "page"
+PAGE_SIZE = int(os.getenv("TONYBET_PAGE_SIZE", "100"))
+PAGE_CONCURRENCY = int(os.getenv("TONYBET_PAGE_CONCURRENCY", "4"))
+MAX_PAGES = int(os.getenv("TONYBET_MAX_PAGES", "50"))
+
+
+def merge_event_pages(pages):
+    """
+    Merges several event/list responses into one of the same shape:
+    items deduplicated by id (first page wins), relations merged per key
+    (dict relations like odds are keyed by event id, list relations like
+    league/competitors are deduplicated by id).
+    """
+    items = []
+    seen_ids = set()
+    relations = {}
+    relation_ids = {}  # list relation -> ids already merged
+    status = None
+
+    for page in pages:
+        if not isinstance(page, dict):
+            continue
+        if status is None:
+            status = page.get("status")
+        data = page.get("data") or {}
+
+        for item in data.get("items", []):
+            item_id = item.get("id")
+            if item_id in seen_ids:
+                continue
+            seen_ids.add(item_id)
+            items.append(item)
+
+        for key, value in (data.get("relations") or {}).items():
+            if isinstance(value, dict):
+                merged = relations.setdefault(key, {})
+                for sub_key, sub_value in value.items():
+                    merged.setdefault(sub_key, sub_value)
+            elif isinstance(value, list):
+                merged = relations.setdefault(key, [])
+                known = relation_ids.setdefault(key, set())
+                for entry in value:
+                    entry_id = entry.get("id") if isinstance(entry, dict) else None
+                    if entry_id is not None and entry_id in known:
+                        continue
+                    if entry_id is not None:
+                        known.add(entry_id)
+                    merged.append(entry)
+            else:
+                relations.setdefault(key, value)
+
+    return {"status": status, "data": {"items": items, "relations": relations}}
+
+
+class TonybetApiClient:
+    """
+    Pooled async HTTP client for the Tonybet platform API (keep-alive, HTTP/2
+    when h2 is installed). One client is shared by every scraper thread
+    through a private event loop, so connections stay warm across cycles.
+    """
+
+    def __init__(self, timeout=REQUEST_TIMEOUT, max_connections=20, http2=HTTP2_AVAILABLE,
+                 prime_cookies=True, transport=None):
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.http2 = http2
+        self.prime_cookies = prime_cookies
+        self.transport = transport  # Lets the local stub tests swap the network out
+        self._loop = None
+        self._client = None
+        self._start_lock = threading.Lock()
+        self._cookies_primed_at = 0
+        self.requests = 0
+
+    # --- private event loop -------------------------------------------------
+
+    def _ensure_loop(self):
+        with self._start_lock:
+            if self._loop is not None:
+                return self._loop
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="tonybet-api", daemon=True)
+            thread.start()
+            self._loop = loop
+            return loop
+
+    def run(self, coro):
+        """Runs a coroutine on the client's loop from any (sync) scraper thread."""
+        loop = self._ensure_loop()
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+    def _get_client(self):
+        if self._client is None:
+            kwargs = {
+                "http2": self.http2,
+                "timeout": self.timeout,
+                "limits": httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections),
+                "headers": {
+                    "User-Agent": USER_AGENT,
+                    "Accept": "application/json, text/plain, */*",
+                    "Accept-Language": "es-ES,es;q=0.9",
+                },
+                "follow_redirects": True,
+            }
+            if self.transport is not None:
+                kwargs["transport"] = self.transport
+            self._client = httpx.AsyncClient(**kwargs)
+        return self._client
+
+    # --- cookies --------------------------------------------------------------
+
+    def load_cookies(self, cookies):
+        """Loads Playwright-style cookies (context.cookies()) into the HTTP client. Thread-safe."""
+        self.run(self._load_cookies_async(cookies))
+        self._cookies_primed_at = time.time()
+
+    async def _load_cookies_async(self, cookies):
+        # Runs on the client's loop so the cookie jar is never touched mid-request
+        client = self._get_client()
+        for c in cookies:
+            client.cookies.set(c["name"], c["value"], domain=c.get("domain", ""), path=c.get("path", "/"))
+
+    def _prime_cookies(self, site_url):
+        # Only the cookie handshake needs a real browser; the pool keeps it warm
+        try:
+            from browser_pool import browser_pool
+            with browser_pool.lease("tonybet", block="cookies") as context:
+                page = context.new_page()
+                page.goto(site_url, timeout=60000, wait_until="domcontentloaded")
+                cookies = context.cookies()
+            self.load_cookies(cookies)
+            print(f"[TonybetAPI] Primed {len(cookies)} cookies from {site_url}")
+        except Exception as e:
+            # The API usually answers without cookies too; just don't retry every call
+            self._cookies_primed_at = time.time()
+            print(f"[TonybetAPI] Cookie priming failed ({e}), continuing without browser cookies")
+
+    def ensure_cookies(self, site_url):
+        if not self.prime_cookies:
+            return
+        if time.time() - self._cookies_primed_at > COOKIE_TTL:
+            self._prime_cookies(site_url)
+
+    # --- requests -------------------------------------------------------------
+
+    async def get_json(self, url, params=None):
+        client = self._get_client()
+        self.requests += 1
+        response = await client.get(url, params=params)
+        response.raise_for_status()
+        return response.json()
+
+    async def event_list_async(self, api_host, params):
+        return await self.get_json(f"{api_host}{EVENT_LIST_PATH}", params=params)
+
+    async def event_list_pages_async(self, api_host, params, page_size=PAGE_SIZE,
+                                     concurrency=PAGE_CONCURRENCY, max_pages=MAX_PAGES):
+        """
+        Walks every event/list page. Pages are fetched `concurrency` at a time
+        until one comes back short (fewer than page_size items) or adds no
+        new event ids (API ignoring the page param). Returns the raw pages.
+        """
+        base = [(k, v) for k, v in params if k not in ("limit", PAGE_PARAM)]
+        base.append(("limit", str(page_size)))
+
+        async def fetch_page(number):
+            return await self.event_list_async(api_host, base + [(PAGE_PARAM, str(number))])
+
+        pages = []
+        seen_ids = set()
+        next_page = 1
+        while next_page <= max_pages:
+            numbers = range(next_page, min(next_page + concurrency, max_pages + 1))
+            wave = await asyncio.gather(*(fetch_page(n) for n in numbers))
+            next_page = numbers[-1] + 1
+
+            done = False
+            for page in wave:
+                items = ((page or {}).get("data") or {}).get("items", [])
+                new_ids = {item.get("id") for item in items} - seen_ids
+                if not new_ids:
+                    done = True
+                    break
+                seen_ids |= new_ids
+                pages.append(page)
+                if len(items) < page_size:
+                    done = True
+                    break
+            if done:
+                break
+        return pages
+
+    def event_list_pages(self, api_host, params, site_url=None, **kwargs):
+        """
+        Sync entry point: all event/list pages merged into a single response
+        (same shape as event_list, so the existing parsers work unchanged).
+        """
+        if site_url:
+            self.ensure_cookies(site_url)
+        start = time.time()
+        try:
+            pages = self.run(self.event_list_pages_async(api_host, params, **kwargs))
+        except httpx.HTTPStatusError as e:
+            if site_url and e.response.status_code in (401, 403):
+                self._cookies_primed_at = 0
+                self.ensure_cookies(site_url)
+                pages = self.run(self.event_list_pages_async(api_host, params, **kwargs))
+            else:
+                raise
+        merged = merge_event_pages(pages)
+        print(f"[TonybetAPI] {len(merged['data']['items'])} events from {len(pages)} page(s) in {time.time() - start:.2f}s")
+        return merged
+
+    def event_list(self, api_host, params, site_url=None):
+        """
+        Sync entry point for the scrapers: GET {api_host}/api/event/list.
+        Returns the raw JSON (same shape page.evaluate(fetch) used to return).
+        """
+        if site_url:
+            self.ensure_cookies(site_url)
+        try:
+            return self.run(self.event_list_async(api_host, params))
+        except httpx.HTTPStatusError as e:
+            if site_url and e.response.status_code in (401, 403):
+                # Session expired: re-prime once and retry
+                self._cookies_primed_at = 0
+                self.ensure_cookies(site_url)
+                return self.run(self.event_list_async(api_host, params))
+            raise
+
+    def close(self):
+        if self._client is not None and self._loop is not None:
+            self.run(self._client.aclose())
+            self._client = None
+
+
+# Shared by every scraper module
+tonybet_api = TonybetApiClient()